@@ -16,6 +16,9 @@ from pathlib import Path
 script_dir = Path(__file__).parent.absolute()
 os.chdir(script_dir)
 
+# Documentation directory (auto-ingest + daily scheduler both use this)
+DOCS_DIR = (script_dir / "docs").resolve()
+
 from src.config import config
 from src.rag import RAGPipeline
 from src.bot import MudrexBot
@@ -24,10 +27,11 @@ from src.mcp import MudrexMCPClient
 from src.tasks.scheduler import setup_scheduler
 from src.lib.error_reporter import report_error_sync, report_error
 from src.health import set_components, start_health_server
+from src import health
 from src.lib.metrics import init_service_info, update_documents_count
 
 # Configure structured logging
-from src.lib.logging import configure_logging, get_logger
+from src.lib.logging import configure_logging, get_logger, stop_logging_listener
 
 # Use JSON format in production, colored console in development
 is_production = os.getenv("RAILWAY_ENVIRONMENT") == "production"
@@ -51,96 +55,185 @@ def validate_config():
         sys.exit(1)
 
 
-async def async_main():
-    """Async main application entry point"""
-    logger.info("=" * 60)
-    logger.info("  Mudrex API Bot - Starting Up")
-    logger.info("=" * 60)
-    
-    # Validate configuration
-    validate_config()
-    logger.info("Configuration validated")
-    
-    # Start health server FIRST so Railway health check passes during slow init
-    health_port = int(os.getenv("PORT") or os.getenv("HEALTH_PORT", "8080"))
-    health_task = asyncio.create_task(start_health_server(port=health_port))
-    logger.info(f"Health server starting on port {health_port}")
-    
-    # Initialize RAG pipeline
+def _init_rag(progress_cb=None):
+    """Build the RAG pipeline: construct, migrate pickle→Qdrant if needed, auto-ingest docs.
+
+    Runs in a worker thread (embedding-model load + Qdrant/pickle I/O are blocking)
+    so the event loop keeps serving health probes and the MCP handshake in parallel.
+    progress_cb, if given, receives the cumulative chunk count per ingest batch.
+    """
+    # Bind config lookups once up front - makes the startup branching explicit
+    qdrant_enabled = bool(config.QDRANT_URL and config.QDRANT_API_KEY)
+    persist_dir = Path(config.CHROMA_PERSIST_DIR)
+
     logger.info("Initializing RAG pipeline...")
     rag_pipeline = RAGPipeline()
-    
-    # One-time migration: Pickle → Qdrant (if Qdrant is configured)
-    if config.QDRANT_URL and config.QDRANT_API_KEY:
-        logger.info("Qdrant configured - checking for migration...")
-        try:
-            # Check if we're using pickle (not Qdrant)
-            if not rag_pipeline.vector_store.use_qdrant:
-                logger.info("Currently using pickle storage - attempting migration to Qdrant...")
-                pickle_path = Path(config.CHROMA_PERSIST_DIR) / "vectors.pkl"
-                if pickle_path.exists():
+
+    # One-time migration: Pickle → Qdrant (if Qdrant is configured).
+    # Check the local filesystem first (pure syscalls) so redeploys with nothing
+    # to migrate never touch the Qdrant client for this.
+    if qdrant_enabled:
+        pickle_path = persist_dir / "vectors.pkl"
+        migrated_marker = persist_dir / ".migrated"
+        if migrated_marker.exists() or not pickle_path.exists():
+            logger.info("No pickle data to migrate - skipping migration check")
+        else:
+            logger.info("Qdrant configured - checking for migration...")
+            try:
+                # Check if we're using pickle (not Qdrant)
+                if not rag_pipeline.vector_store.use_qdrant:
+                    logger.info("Currently using pickle storage - attempting migration to Qdrant...")
                     # Migrate existing pickle data
                     if rag_pipeline.vector_store.export_to_qdrant():
                         logger.info("✓ Successfully migrated pickle data to Qdrant")
+                        migrated_marker.touch()
                         # Reinitialize to use Qdrant
                         rag_pipeline = RAGPipeline()
                     else:
                         logger.warning("Migration failed - will ingest docs directly to Qdrant")
                 else:
-                    logger.info("No pickle data found - will ingest docs directly to Qdrant")
-            else:
-                logger.info("Already using Qdrant - no migration needed")
-        except Exception as e:
-            logger.warning(f"Migration check failed: {e} - continuing with normal flow")
-    
+                    logger.info("Already using Qdrant - no migration needed")
+                    migrated_marker.touch()
+            except Exception as e:
+                logger.warning(f"Migration check failed: {e} - continuing with normal flow")
+
     # Check document count
     stats = rag_pipeline.get_stats()
     if stats['total_documents'] == 0:
         logger.warning("No documents in vector store!")
         logger.info("Attempting to auto-ingest documentation...")
-        
-        # Try to ingest docs automatically
-        docs_dir = Path(__file__).parent / "docs"
-        if docs_dir.exists() and any(docs_dir.glob("*.md")):
-            logger.info(f"Found docs directory with {len(list(docs_dir.glob('*.md')))} files")
+
+        # Try to ingest docs automatically (single scandir pass, no per-entry Path objects)
+        try:
+            md_files = [e.name for e in os.scandir(DOCS_DIR) if e.name.endswith(".md")]
+        except FileNotFoundError:
+            md_files = []
+        if md_files:
+            logger.info(f"Found docs directory with {len(md_files)} files")
             try:
-                num_chunks = rag_pipeline.ingest_documents(str(docs_dir))
+                num_chunks = rag_pipeline.ingest_documents(str(DOCS_DIR), progress_cb=progress_cb)
                 if num_chunks > 0:
                     logger.info(f"✓ Successfully auto-ingested {num_chunks} chunks")
                     stats = rag_pipeline.get_stats()
                     logger.info(f"✓ Vector store now has {stats['total_documents']} documents")
-                    # Clear semantic cache so old cached answers (e.g. from before re-ingest) are not returned
-                    if rag_pipeline.semantic_cache:
-                        rag_pipeline.semantic_cache.clear()
-                        logger.info("Cleared semantic cache (stale answers from previous docs removed)")
+                    # Drop cached answers only if the docs actually changed since the last
+                    # ingest; an unchanged redeploy keeps the semantic cache warm
+                    rag_pipeline.invalidate_semantic_cache_if_changed(str(DOCS_DIR))
                 else:
                     logger.warning("Ingestion returned 0 chunks. Check docs directory.")
             except Exception as e:
                 logger.error(f"Failed to auto-ingest docs: {e}")
                 logger.info("Run manually: python3 scripts/ingest_docs.py")
         else:
-            logger.warning(f"Docs directory not found or empty: {docs_dir}")
+            logger.warning(f"Docs directory not found or empty: {DOCS_DIR}")
             logger.info("Run: python3 scripts/scrape_docs.py && python3 scripts/ingest_docs.py")
     else:
         logger.info(f"Loaded {stats['total_documents']} document chunks")
-    
-    # Initialize MCP client with service account (read-only key for public data)
-    mcp_client = None
-    if config.MCP_ENABLED:
-        logger.info("Initializing MCP client (service account mode)...")
-        mcp_client = MudrexMCPClient(api_secret=config.MUDREX_API_SECRET)
-        try:
-            await mcp_client.connect()
-            if mcp_client.is_authenticated():
-                tools = mcp_client.get_safe_tools()
-                logger.info(f"MCP connected with service account - {len(tools)} public tools available")
-            else:
-                logger.warning("MCP service account key not configured - public data features disabled")
-                logger.info("Set MUDREX_API_SECRET in .env with a read-only service account key")
-        except Exception as e:
-            logger.warning(f"MCP connection failed: {e}")
-            logger.info("Bot will work without MCP features")
-    
+
+    # Prewarm Gemini so the first user query doesn't pay client init latency;
+    # runs inside the startup thread, overlapped with the MCP handshake
+    rag_pipeline.gemini_client.warmup()
+
+    return rag_pipeline, stats
+
+
+class LazyRAG:
+    """Lock-guarded lazy accessor for the RAG pipeline.
+
+    The heavy construction (embedding model load, Qdrant connect, pickle read,
+    auto-ingest) only runs on the first `get()` call, in a worker thread. Callers
+    that just want to inspect state (health checks) use `pipeline` / `stats`,
+    which return None until the pipeline has actually been built.
+    """
+
+    def __init__(self):
+        self._pipeline = None
+        self._stats = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def pipeline(self):
+        """The built pipeline, or None if not yet initialized."""
+        return self._pipeline
+
+    @property
+    def stats(self):
+        """Vector-store stats captured at build time, or None if not yet initialized."""
+        return self._stats
+
+    async def get(self):
+        """Return the RAG pipeline, building it on first call (double-checked lock)."""
+        if self._pipeline is None:
+            async with self._lock:
+                if self._pipeline is None:
+                    # Stream ingest progress into Prometheus so the documents
+                    # gauge moves during long ingests instead of sitting at 0.
+                    # _init_rag runs in a thread, so hop back to the loop.
+                    loop = asyncio.get_running_loop()
+
+                    def progress_cb(n: int):
+                        loop.call_soon_threadsafe(update_documents_count, n)
+
+                    self._pipeline, self._stats = await asyncio.to_thread(_init_rag, progress_cb)
+        return self._pipeline
+
+
+async def _heartbeat(interval: float = 1.0):
+    """Mark the event loop alive every `interval` seconds.
+
+    /health/live compares against the last tick, so a long blocking call leaked
+    into the loop shows up as a failed liveness probe instead of a silent stall.
+    """
+    while True:
+        health.tick()
+        await asyncio.sleep(interval)
+
+
+async def _init_mcp():
+    """Connect the MCP client with the service account (read-only key for public data)."""
+    if not config.MCP_ENABLED:
+        return None
+    logger.info("Initializing MCP client (service account mode)...")
+    mcp_client = MudrexMCPClient(api_secret=config.MUDREX_API_SECRET)
+    try:
+        await mcp_client.connect()
+        if mcp_client.is_authenticated():
+            tools = mcp_client.get_safe_tools()
+            logger.info(f"MCP connected with service account - {len(tools)} public tools available")
+        else:
+            logger.warning("MCP service account key not configured - public data features disabled")
+            logger.info("Set MUDREX_API_SECRET in .env with a read-only service account key")
+    except Exception as e:
+        logger.warning(f"MCP connection failed: {e}")
+        logger.info("Bot will work without MCP features")
+    return mcp_client
+
+
+async def async_main():
+    """Async main application entry point"""
+    logger.info("=" * 60)
+    logger.info("  Mudrex API Bot - Starting Up")
+    logger.info("=" * 60)
+
+    # Validate configuration
+    validate_config()
+    logger.info("Configuration validated")
+
+    # Start health server FIRST so Railway health check passes during slow init
+    health_port = int(os.getenv("PORT") or os.getenv("HEALTH_PORT", "8080"))
+    health_task = asyncio.create_task(start_health_server(port=health_port))
+    heartbeat_task = asyncio.create_task(_heartbeat())
+    logger.info(f"Health server starting on port {health_port}")
+
+    # RAG init (CPU + disk, in a thread) and MCP connect (network) are independent —
+    # overlap them so cold start costs max-of-phases instead of sum-of-phases
+    lazy_rag = LazyRAG()
+    rag_pipeline, mcp_client = await asyncio.gather(
+        lazy_rag.get(),
+        _init_mcp(),
+    )
+    stats = lazy_rag.stats
+
     # Initialize bot
     logger.info("Initializing Telegram bot...")
     bot = MudrexBot(rag_pipeline, mcp_client)
@@ -159,16 +252,20 @@ async def async_main():
     # Scheduler for daily changelog scrape + ingest + broadcast
     scheduler = None
     if config.ENABLE_CHANGELOG_WATCHER:
-        docs_dir = Path(__file__).parent / "docs"
-        scheduler = setup_scheduler(bot, rag_pipeline, docs_dir)
+        scheduler = setup_scheduler(bot, rag_pipeline, DOCS_DIR)
         scheduler.start()
     
     # Shutdown event: SIGTERM/SIGINT set this so we stop polling immediately (critical for Railway deploy)
     shutdown_event = asyncio.Event()
+
+    def _request_shutdown(sig: signal.Signals):
+        logger.info(f"Received {sig.name} - shutting down gracefully")
+        shutdown_event.set()
+
     try:
         loop = asyncio.get_running_loop()
         for sig in (signal.SIGTERM, signal.SIGINT):
-            loop.add_signal_handler(sig, lambda s=sig: shutdown_event.set())
+            loop.add_signal_handler(sig, _request_shutdown, sig)
     except NotImplementedError:
         pass  # Windows has no add_signal_handler
 
@@ -242,29 +339,46 @@ async def async_main():
         logger.info("Shutdown complete")
 
 
+def _report_error_bounded(error: Exception, error_type: str, timeout: float = 2.0):
+    """Report to Station Master from a daemon thread, waiting at most `timeout`.
+
+    A crash must not block interpreter exit on a slow/unreachable reporting
+    endpoint - that delays restart loops and causes health flapping.
+    """
+    import threading
+
+    reporter = threading.Thread(
+        target=report_error_sync, args=(error, error_type), daemon=True
+    )
+    reporter.start()
+    reporter.join(timeout)
+    if reporter.is_alive():
+        logger.warning("Error report still in flight after %.1fs - exiting anyway", timeout)
+
+
 def setup_global_error_handlers():
     """Setup global error handlers for uncaught exceptions"""
     import sys
-    
+
     def handle_uncaught_exception(exc_type, exc_value, exc_traceback):
         """Handle uncaught exceptions"""
         if issubclass(exc_type, KeyboardInterrupt):
             sys.__excepthook__(exc_type, exc_value, exc_traceback)
             return
-        
+
         error = exc_value if isinstance(exc_value, Exception) else Exception(str(exc_value))
         logger.error(f"Uncaught exception: {error}", exc_info=(exc_type, exc_value, exc_traceback))
-        
-        # Report to Station Master (sync version for exception hook)
-        report_error_sync(error, "crash")
-        
+
+        # Report to Station Master without letting a slow upstream delay the crash exit
+        _report_error_bounded(error, "crash")
+
         sys.__excepthook__(exc_type, exc_value, exc_traceback)
-    
+
     def handle_unhandled_rejection(reason):
         """Handle unhandled promise rejections (for asyncio)"""
         error = reason if isinstance(reason, Exception) else Exception(str(reason))
         logger.error(f"Unhandled exception in async task: {error}", exc_info=True)
-        report_error_sync(error, "exception")
+        _report_error_bounded(error, "exception")
     
     # Set exception handler
     sys.excepthook = handle_uncaught_exception
@@ -286,6 +400,8 @@ def main():
         logger.error(f"Application error: {e}", exc_info=True)
         report_error_sync(e, "crash")
         sys.exit(1)
+    finally:
+        stop_logging_listener()
 
 
 if __name__ == "__main__":
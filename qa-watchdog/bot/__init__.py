@@ -0,0 +1 @@
+"""QA Watchdog Telegram bot"""
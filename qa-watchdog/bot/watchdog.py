@@ -0,0 +1,687 @@
+"""
+QA Watchdog Bot - exercises the copilot through real Telegram messages
+
+Sends test questions into a dedicated test group mentioning the copilot bot,
+waits for its replies, grades them and reports failures.
+
+Copyright (c) 2025 DecentralizedJM
+Licensed under MIT License
+"""
+import asyncio
+import logging
+import re
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+
+from pathlib import Path
+
+import aiohttp
+from typing import Dict, List, Optional
+
+from telegram import Message, Update
+from telegram.ext import (
+    Application,
+    CommandHandler,
+    ContextTypes,
+    MessageHandler,
+    filters,
+)
+
+from config import Config
+from qa.grader import DailySummary, GradeResult, ResponseGrader
+from qa.grader_cache import FileBackend, GraderCache
+from qa.report_manager import ReportManager
+from qa.semantic_cache import QASemanticCache, SemanticGradeCache
+from qa.reporter import Reporter
+from qa.test_bank import TestBank, TestCase
+
+logger = logging.getLogger(__name__)
+
+# Copilot error phrases, compiled once at import - one C-level scan per response
+_ERROR_RE = re.compile(
+    r"something went wrong|please try again|internal error|temporarily unavailable",
+    re.IGNORECASE,
+)
+
+
+class _FromUserFilter(filters.MessageFilter):
+    """Sender prefilter matching the username case-insensitively
+
+    PTB's filters.User compares usernames exactly, but Telegram usernames
+    are case-insensitive - a differently-cased COPILOT_BOT_USERNAME would
+    silently drop every copilot reply before _is_from_copilot ever ran.
+    """
+
+    def __init__(self, username: str):
+        super().__init__()
+        self._username_lc = (username or "").lower().lstrip("@")
+
+    def filter(self, message: Message) -> bool:
+        sender = message.from_user.username if message.from_user else None
+        return bool(sender) and sender.lower() == self._username_lc
+
+
+@dataclass(slots=True)
+class _Pending:
+    """State for one in-flight test, keyed by its sent message_id"""
+    test_case: TestCase
+    sent_time: float
+    future: "asyncio.Future[Message]"
+
+
+class QAWatchdogBot:
+    """Runs QA suites against the copilot bot over Telegram"""
+
+    def __init__(self, config: Config):
+        self.config = config
+        self.test_bank = TestBank(
+            config.GEMINI_API_KEY,
+            data_dir=config.DATA_DIR,
+            model=config.GEMINI_MODEL,
+        )
+        grade_cache = None
+        if config.SEMANTIC_CACHE_ENABLED:
+            grade_cache = SemanticGradeCache(
+                config.GEMINI_API_KEY, data_dir=config.DATA_DIR
+            )
+        self.grader = ResponseGrader(
+            config.GEMINI_API_KEY,
+            model=config.GEMINI_MODEL,
+            semantic_cache=grade_cache,
+        )
+        self.report_manager = ReportManager(config.REPORTS_DIR)
+        self.reporter = Reporter()
+        # Grading is temperature-0, so identical (question, response) pairs
+        # always grade the same - cache them across reruns.
+        self._grader_cache = GraderCache(
+            FileBackend(str(Path(config.DATA_DIR) / "grader_cache")),
+            model=config.GEMINI_MODEL,
+        )
+        self._semantic_cache: Optional[QASemanticCache] = None
+        if config.SEMANTIC_CACHE_ENABLED:
+            self._semantic_cache = QASemanticCache(
+                config.GEMINI_API_KEY,
+                data_dir=config.DATA_DIR,
+                threshold=config.SEMANTIC_CACHE_THRESHOLD,
+                ttl_seconds=config.SEMANTIC_CACHE_TTL,
+            )
+
+        self.app: Optional[Application] = None
+        self.bot = None
+        self._http: Optional[aiohttp.ClientSession] = None
+
+        # In-flight test state, keyed by the sent message_id. The pointer
+        # tracks the most recently sent test so the non-threaded reply
+        # fallback is O(1) instead of a max() scan per incoming message.
+        self._pending: Dict[int, _Pending] = {}
+        self._latest_pending_id: Optional[int] = None
+
+        # Bounded concurrency for parallel suite runs; outbound sends are
+        # paced by a token bucket over the last second (SEND_RATE msgs/sec)
+        # so bursts are allowed but Telegram's cap is never exceeded.
+        self._test_sem = asyncio.Semaphore(config.MAX_CONCURRENT_TESTS)
+        self._send_times: deque = deque()
+
+        # Hot-path constants hoisted out of the per-test send and the
+        # per-message sender check
+        self._mention_suffix = " @" + config.COPILOT_BOT_USERNAME
+        self._chat_id = config.QA_TEST_GROUP_ID
+        self._timeout = config.RESPONSE_TIMEOUT
+        self._copilot_username_lc = (config.COPILOT_BOT_USERNAME or "").lower().lstrip("@")
+
+        # Per-chat worker queues: updates are matched serially within a chat
+        # (preserving ordering) but chats never block each other, so a slow
+        # path in one test chat can't delay reply capture in another.
+        self._chat_queues: Dict[int, asyncio.Queue] = {}
+        self._chat_workers: Dict[int, asyncio.Task] = {}
+
+        # Failures stream through a worker that batches within FLUSH_WINDOW
+        # and sends one digest per batch, so a bad run costs one Telegram
+        # call instead of one per failure.
+        self._failure_q: asyncio.Queue = asyncio.Queue()
+        self._failure_workers: List[asyncio.Task] = []
+
+        # /qa_status hits the reports directory; cache the scan briefly so
+        # bursts of status checks don't re-walk the disk.
+        self._recent_cache: tuple = (0.0, [])
+        self._recent_cache_ttl = 30.0
+
+        # Command-triggered runs are fire-and-forget; the loop only holds
+        # weak refs to tasks, so keep strong ones here until completion.
+        self._bg_tasks: set = set()
+
+        self._suite_running = False
+        self._tests_today = 0
+
+    def _spawn(self, coro) -> asyncio.Task:
+        """create_task with a strong reference until the task finishes"""
+        task = asyncio.create_task(coro)
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
+        return task
+
+    async def start(self):
+        """Build the PTB application and start receiving updates"""
+        # Grading runs in threads (asyncio.to_thread); make sure the default
+        # executor can host one grader per concurrent test.
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=max(8, self.config.MAX_CONCURRENT_TESTS + 4))
+        )
+        # Default pool size (8) saturates when MAX_CONCURRENT_TESTS tests and
+        # failure alerts send at once, surfacing as spurious pool timeouts.
+        # getUpdates gets its own small pool so long-polling never starves sends.
+        self.app = (
+            Application.builder()
+            .token(self.config.QA_TELEGRAM_BOT_TOKEN)
+            .connection_pool_size(32)
+            .pool_timeout(20)
+            .get_updates_connection_pool_size(4)
+            .get_updates_pool_timeout(40)
+            .build()
+        )
+        self.bot = self.app.bot
+
+        self.app.add_handler(CommandHandler("qa_status", self._cmd_status))
+        self.app.add_handler(CommandHandler("qa_report", self._cmd_report))
+        self.app.add_handler(CommandHandler("run_qa", self._cmd_run_qa))
+        self.app.add_handler(CommandHandler("run_critical", self._cmd_run_critical))
+        # Prefilter by sender so group chatter never wakes the handler
+        # coroutine - only the copilot's own messages enter Python.
+        self.app.add_handler(
+            MessageHandler(
+                filters.Chat(self.config.QA_TEST_GROUP_ID)
+                & filters.TEXT
+                & _FromUserFilter(self.config.COPILOT_BOT_USERNAME),
+                self._on_message,
+            )
+        )
+
+        # One shared session for direct-API tests: keep-alive connections and
+        # a warm DNS cache instead of a TCP+TLS handshake per call.
+        if self.config.COPILOT_API_URL:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=32, ttl_dns_cache=300, keepalive_timeout=60
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.config.RESPONSE_TIMEOUT),
+            )
+
+        # A single worker keeps alert ordering exact and batching natural
+        self._failure_workers = [asyncio.create_task(self._failure_worker())]
+
+        await self.app.initialize()
+        await self.app.start()
+        if self.config.USE_WEBHOOK:
+            # Webhook delivery avoids the long-poll round-trip on every
+            # copilot reply, shortening _run_single_test wall time.
+            await self.app.updater.start_webhook(
+                listen="0.0.0.0",
+                port=self.config.WEBHOOK_PORT,
+                url_path=self.config.QA_TELEGRAM_BOT_TOKEN,
+                webhook_url=f"{self.config.PUBLIC_URL}/{self.config.QA_TELEGRAM_BOT_TOKEN}",
+                secret_token=self.config.WEBHOOK_SECRET or None,
+                drop_pending_updates=True,
+            )
+            logger.info("QA Watchdog started (webhook on :%d)", self.config.WEBHOOK_PORT)
+        else:
+            await self.app.updater.start_polling(drop_pending_updates=True)
+            logger.info("QA Watchdog started (polling)")
+
+    async def stop(self):
+        """Stop the bot cleanly"""
+        if self._bg_tasks:
+            await asyncio.gather(*self._bg_tasks, return_exceptions=True)
+        if self._failure_workers:
+            await self._failure_q.join()
+            for task in self._failure_workers:
+                task.cancel()
+            self._failure_workers = []
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+        # Let queued report writes reach disk before exiting
+        await asyncio.to_thread(self.report_manager.flush, 10.0)
+        for task in self._chat_workers.values():
+            task.cancel()
+        self._chat_workers.clear()
+        self._chat_queues.clear()
+        if self.app:
+            await self.app.updater.stop()
+            await self.app.stop()
+            await self.app.shutdown()
+        logger.info("QA Watchdog stopped")
+
+    # ------------------------------------------------------------------
+    # Suite execution
+    # ------------------------------------------------------------------
+
+    async def run_qa_suite(self, count: Optional[int] = None) -> List[GradeResult]:
+        """Run the daily suite with bounded concurrency and send the summary"""
+        if self._suite_running:
+            logger.warning("Suite already running, skipping")
+            return []
+        self._suite_running = True
+        self.grader.clear_run_cache()
+        try:
+            # Suite building hits Gemini (creative questions) and disk
+            # (history) - keep it off the loop so replies keep flowing.
+            tests = await asyncio.to_thread(
+                self.test_bank.get_daily_suite,
+                count=count or self.config.DAILY_TEST_COUNT,
+            )
+            logger.info(
+                "Running QA suite: %d tests, max %d concurrent",
+                len(tests), self.config.MAX_CONCURRENT_TESTS,
+            )
+
+            # One batched embed call for the whole suite's questions
+            if self._semantic_cache is not None:
+                await asyncio.to_thread(
+                    self._semantic_cache.prewarm_embeddings,
+                    [tc.question for tc in tests],
+                )
+
+            async def _bounded(tc: TestCase) -> GradeResult:
+                async with self._test_sem:
+                    result = await self._run_single_test(tc)
+                    if not result.passed:
+                        self._report_failure_soon(result)
+                    return result
+
+            results = list(await asyncio.gather(*[_bounded(tc) for tc in tests]))
+
+            # Flush outstanding failure reports before summarising
+            await self._failure_q.join()
+
+            summary = self._generate_summary(results, date_str=time.strftime("%Y-%m-%d"))
+            self.report_manager.save_daily_summary(summary)
+            await self._send_summary(summary)
+            return results
+        finally:
+            self._suite_running = False
+
+    async def run_critical_tests(self) -> List[GradeResult]:
+        """Run the fixed critical tests one at a time (strict isolation).
+
+        Pacing comes from the send token bucket; no fixed inter-test sleep.
+        """
+        tests = self.test_bank.get_critical_tests()
+        logger.info("Running %d critical tests", len(tests))
+        results = []
+        for test_case in tests:
+            result = await self._run_single_test(test_case)
+            results.append(result)
+            if not result.passed:
+                self._report_failure_soon(result)
+        return results
+
+    async def run_spot_check(self) -> GradeResult:
+        """Run a single random test"""
+        test_case = await asyncio.to_thread(self.test_bank.get_spot_check)
+        result = await self._run_single_test(test_case)
+        if not result.passed:
+            self._report_failure_soon(result)
+        return result
+
+    async def _acquire_send_slot(self):
+        """Wait until the token bucket allows another outbound send"""
+        while True:
+            now = time.monotonic()
+            while self._send_times and now - self._send_times[0] >= 1.0:
+                self._send_times.popleft()
+            if len(self._send_times) < self.config.SEND_RATE:
+                self._send_times.append(now)
+                return
+            await asyncio.sleep(self._send_times[0] + 1.0 - now)
+
+    async def _run_single_test(self, test_case: TestCase) -> GradeResult:
+        """Send one test question, wait for the copilot's reply and grade it"""
+        # Paraphrase hit: reuse the cached answer and grade, skipping both
+        # the Telegram round-trip and the grader's Gemini call.
+        if self._semantic_cache is not None:
+            cached = await asyncio.to_thread(
+                self._semantic_cache.get, test_case.question
+            )
+            if cached is not None:
+                return self._result_from_cache(test_case, cached)
+
+        # API mode: hit the copilot's HTTP endpoint, skipping Telegram
+        if self._http is not None:
+            return await self._run_via_api(test_case)
+
+        question = test_case.question + self._mention_suffix
+        # Bound before the send so the finally block can't hit an
+        # UnboundLocalError (masking the real exception) if send_message raises.
+        message_id: Optional[int] = None
+
+        await self._acquire_send_slot()
+        message = await self.bot.send_message(
+            chat_id=self._chat_id,
+            text=question,
+        )
+
+        message_id = message.message_id
+        # Monotonic clock: wall time can jump on NTP correction and produce
+        # negative response times that poison the suite averages.
+        pending = _Pending(
+            test_case,
+            time.monotonic(),
+            asyncio.get_running_loop().create_future(),
+        )
+        self._pending[message_id] = pending
+        self._latest_pending_id = message_id
+
+        try:
+            # The Future delivers the Message directly - no side dict and no
+            # Event-then-lookup race.
+            response = await asyncio.wait_for(pending.future, timeout=self._timeout)
+            response_time = time.monotonic() - pending.sent_time
+            response_text = response.text or ""
+
+            is_error = bool(_ERROR_RE.search(response_text))
+
+            self._tests_today += 1
+            # Grading hits Gemini synchronously - run it off the loop so
+            # _on_message keeps capturing replies for other in-flight tests.
+            if is_error:
+                # Pure local fast path - no Gemini call, no thread hop
+                return self.grader.grade_error_response(
+                    test_case, response_text, response_time
+                )
+            result = await asyncio.to_thread(
+                self._grade_cached,
+                test_case, response_text, response_time, message_id,
+            )
+            # Only cache passing answers - failures must keep re-testing live
+            if self._semantic_cache is not None and result.passed:
+                await asyncio.to_thread(
+                    self._semantic_cache.set,
+                    test_case.question,
+                    self._cache_payload(result),
+                )
+            return result
+        except asyncio.TimeoutError:
+            self._tests_today += 1
+            logger.warning("Test %s timed out", test_case.id)
+            return self.grader.grade_timeout(test_case, self._timeout)
+        finally:
+            if message_id is not None:
+                self._pending.pop(message_id, None)
+                if self._latest_pending_id == message_id:
+                    # Later tests keep the pointer fresh; replies to this one
+                    # will still match via reply_to_message.
+                    self._latest_pending_id = None
+
+    def _grade_cached(self, test_case: TestCase, response_text: str,
+                      response_time: float,
+                      message_id: Optional[int] = None) -> GradeResult:
+        """Grade via the exact-match cache; only cache misses hit Gemini"""
+        payload = self._grader_cache.get(test_case.question, response_text)
+        if payload is not None:
+            # Timing is per-run, not part of the cached grade
+            payload = dict(payload, response_time=response_time,
+                           message_id=message_id)
+            return self._result_from_cache(test_case, payload)
+        result = self.grader.grade(
+            test_case, response_text, response_time, message_id=message_id
+        )
+        self._grader_cache.set(
+            test_case.question, response_text, self._cache_payload(result)
+        )
+        return result
+
+    @staticmethod
+    def _cache_payload(result: GradeResult) -> Dict:
+        """Serializable grade payload for the semantic cache (no test_case)"""
+        payload = result.to_dict()
+        payload.pop("test_case", None)
+        return payload
+
+    @staticmethod
+    def _result_from_cache(test_case: TestCase, payload: Dict) -> GradeResult:
+        """Rebuild a GradeResult for this test from a cached payload"""
+        return GradeResult(test_case=test_case, **payload)
+
+    async def _run_via_api(self, test_case: TestCase) -> GradeResult:
+        """Run a test against the copilot's HTTP API directly (no Telegram round-trip)"""
+        start = time.monotonic()
+        try:
+            async with self._http.post(
+                self.config.COPILOT_API_URL,
+                json={"question": test_case.question},
+                headers={"Authorization": f"Bearer {self.config.COPILOT_API_KEY}"},
+            ) as resp:
+                data = await resp.json()
+        except asyncio.TimeoutError:
+            self._tests_today += 1
+            logger.warning("API test %s timed out", test_case.id)
+            return self.grader.grade_timeout(test_case, self.config.RESPONSE_TIMEOUT)
+        except (aiohttp.ClientError, ValueError) as e:
+            # Connection failures and non-JSON bodies fail the one test
+            # instead of killing the whole suite
+            self._tests_today += 1
+            logger.warning("API test %s failed: %s", test_case.id, e)
+            return self.grader.grade_error_response(
+                test_case, f"Request failed: {e}", time.monotonic() - start
+            )
+
+        response_time = time.monotonic() - start
+        response_text = data.get("answer", "") if isinstance(data, dict) else ""
+        self._tests_today += 1
+        if _ERROR_RE.search(response_text):
+            # Same pure-local fast path as the Telegram route
+            return self.grader.grade_error_response(
+                test_case, response_text, response_time
+            )
+        result = await asyncio.to_thread(
+            self._grade_cached, test_case, response_text, response_time
+        )
+        if self._semantic_cache is not None and result.passed:
+            await asyncio.to_thread(
+                self._semantic_cache.set,
+                test_case.question,
+                self._cache_payload(result),
+            )
+        return result
+
+    # ------------------------------------------------------------------
+    # Incoming messages
+    # ------------------------------------------------------------------
+
+    def _is_from_copilot(self, message: Message) -> bool:
+        """Is this message from the copilot bot under test?"""
+        sender = message.from_user.username if message.from_user else None
+        return bool(sender) and sender.lower() == self._copilot_username_lc
+
+    async def _on_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Route copilot messages to their chat's worker queue"""
+        message = update.effective_message
+        if not message or not self._is_from_copilot(message):
+            return
+        self._get_chat_queue(message.chat_id).put_nowait(message)
+
+    def _get_chat_queue(self, chat_id: int) -> asyncio.Queue:
+        """Get (or lazily start) the serial worker queue for a chat"""
+        queue = self._chat_queues.get(chat_id)
+        if queue is None:
+            queue = asyncio.Queue()
+            self._chat_queues[chat_id] = queue
+            self._chat_workers[chat_id] = asyncio.create_task(
+                self._chat_loop(chat_id, queue)
+            )
+        return queue
+
+    async def _chat_loop(self, chat_id: int, queue: asyncio.Queue):
+        """Process one chat's messages in order"""
+        while True:
+            message = await queue.get()
+            try:
+                self._match_response(message)
+            except Exception:
+                logger.exception("Error matching response in chat %d", chat_id)
+            finally:
+                queue.task_done()
+
+    def _match_response(self, message: Message):
+        """Match one copilot message to a pending test"""
+        # Preferred: copilot replied directly to our test message
+        if message.reply_to_message:
+            pending = self._pending.get(message.reply_to_message.message_id)
+            if pending is not None and not pending.future.done():
+                pending.future.set_result(message)
+            return
+
+        # Fallback: no reply threading - attribute to the most recent pending test
+        latest_id = self._latest_pending_id
+        if latest_id is not None:
+            pending = self._pending.get(latest_id)
+            if pending is not None and not pending.future.done():
+                pending.future.set_result(message)
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def _report_failure_soon(self, result: GradeResult):
+        """Queue failure reporting off the per-test critical path"""
+        self._failure_q.put_nowait(result)
+
+    # Seconds the failure worker waits for more failures before flushing
+    FLUSH_WINDOW = 5.0
+    # At most this many failures per digest (stays well under 4096 chars)
+    FLUSH_BATCH = 10
+
+    async def _failure_worker(self):
+        """Batch queued failures and send one digest per batch"""
+        while True:
+            batch = [await self._failure_q.get()]
+            while len(batch) < self.FLUSH_BATCH:
+                try:
+                    batch.append(
+                        await asyncio.wait_for(
+                            self._failure_q.get(), timeout=self.FLUSH_WINDOW
+                        )
+                    )
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._report_failures(batch)
+            except Exception:
+                logger.exception("Failure worker error (%d items)", len(batch))
+            finally:
+                for _ in batch:
+                    self._failure_q.task_done()
+
+    async def _report_failures(self, failures: List[GradeResult]):
+        """Save detailed reports to disk and send a single digest alert"""
+        for result in failures:
+            try:
+                await asyncio.to_thread(self.report_manager.save_report, result)
+                self._recent_cache = (0.0, [])  # invalidate /qa_status cache
+            except Exception as e:
+                logger.error("Failed to save report for %s: %s", result.test_case.id, e)
+
+        try:
+            await self.bot.send_message(
+                chat_id=self.config.ALERT_CHAT_ID,
+                text=self.reporter.format_failure_digest(failures),
+                parse_mode="MarkdownV2",
+            )
+        except Exception as e:
+            logger.error("Failed to send failure digest (%d items): %s", len(failures), e)
+
+    def _generate_summary(self, results: List[GradeResult],
+                          date_str: Optional[str] = None) -> DailySummary:
+        """Aggregate suite results into a DailySummary (single pass)"""
+        cat: Dict[str, List[int]] = defaultdict(lambda: [0, 0])  # [passed, total]
+        n_pass = 0
+        total_time = 0.0
+        failed: List[GradeResult] = []
+        for result in results:
+            total_time += result.response_time
+            counts = cat[result.test_case.category]
+            counts[1] += 1
+            if result.passed:
+                n_pass += 1
+                counts[0] += 1
+            else:
+                failed.append(result)
+
+        n = len(results)
+        category_stats = {
+            category: {"passed": p, "total": t, "pass_rate": p / t if t else 0.0}
+            for category, (p, t) in cat.items()
+        }
+
+        return DailySummary(
+            date=date_str or date.today().isoformat(),
+            total_tests=n,
+            passed=n_pass,
+            failed=len(failed),
+            pass_rate=n_pass / n if n else 0.0,
+            avg_response_time=total_time / n if n else 0.0,
+            category_stats=category_stats,
+            failed_tests=failed,
+        )
+
+    async def _send_summary(self, summary: DailySummary):
+        """Send the daily summary to the alert chat"""
+        try:
+            await self.bot.send_message(
+                chat_id=self.config.ALERT_CHAT_ID,
+                text=self.reporter.format_daily_summary(summary),
+                parse_mode="MarkdownV2",
+            )
+        except Exception as e:
+            logger.error("Failed to send summary: %s", e)
+
+    # ------------------------------------------------------------------
+    # Commands
+    # ------------------------------------------------------------------
+
+    async def _cmd_status(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """/qa_status - current watchdog state"""
+        now = time.monotonic()
+        if now - self._recent_cache[0] > self._recent_cache_ttl:
+            self._recent_cache = (now, self.report_manager.get_recent_failures(days=1))
+        recent = self._recent_cache[1]
+        status = "running suite" if self._suite_running else "idle"
+        lines = [
+            "*QA Watchdog Status*",
+            "",
+            f"State: {status}",
+            f"Tests today: {self._tests_today}",
+            f"Pending tests: {len(self._pending)}",
+            f"Failures \\(24h\\): {len(recent)}",
+        ]
+        if recent:
+            lines.append("")
+            lines.append("Recent failures:")
+            lines.extend(f"📄 `{path.name}`" for path in recent[:5])
+        await update.message.reply_text("\n".join(lines), parse_mode="MarkdownV2")
+
+    async def _cmd_report(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """/qa_report - list recent failure reports"""
+        recent = self.report_manager.get_recent_failures(days=7)
+        if not recent:
+            await update.message.reply_text("No failures in the last 7 days 🎉")
+            return
+        lines = [
+            f"*{len(recent)} failure\\(s\\) in the last 7 days*",
+            "",
+            *(f"📄 `{path.name}`" for path in recent[:10]),
+        ]
+        await update.message.reply_text("\n".join(lines), parse_mode="MarkdownV2")
+
+    async def _cmd_run_qa(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """/run_qa - trigger a full suite now"""
+        await update.message.reply_text("Starting QA suite...")
+        self._spawn(self.run_qa_suite())
+
+    async def _cmd_run_critical(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """/run_critical - trigger the critical tests now"""
+        await update.message.reply_text("Running critical tests...")
+        self._spawn(self.run_critical_tests())
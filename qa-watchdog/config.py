@@ -0,0 +1,135 @@
+"""
+Configuration for the QA Watchdog bot
+
+Copyright (c) 2025 DecentralizedJM
+Licensed under MIT License
+"""
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+@dataclass(slots=True, frozen=True)
+class Config:
+    """QA Watchdog configuration (immutable; fixed slot layout)"""
+
+    # Required - Telegram (separate bot from the copilot itself)
+    QA_TELEGRAM_BOT_TOKEN: str = ""
+    QA_TEST_GROUP_ID: int = 0
+
+    # The copilot bot under test (username without @)
+    COPILOT_BOT_USERNAME: str = ""
+
+    # Required - Gemini (grading)
+    GEMINI_API_KEY: str = ""
+    GEMINI_MODEL: str = "gemini-3-flash-preview"
+
+    # Optional - direct Copilot HTTP API (bypasses Telegram round-trip)
+    COPILOT_API_URL: str = ""
+    COPILOT_API_KEY: str = ""
+
+    # Where failure alerts / summaries go (defaults to the test group)
+    ALERT_CHAT_ID: int = 0
+
+    # Test execution
+    RESPONSE_TIMEOUT: int = 60  # seconds to wait for a copilot reply
+    MAX_CONCURRENT_TESTS: int = 4  # in-flight tests during a parallel suite
+    SEND_RATE: float = 20.0  # outbound messages per second (Telegram caps at ~30)
+    DAILY_TEST_COUNT: int = 20
+
+    # Semantic response cache (skips copilot + grader on paraphrase hits)
+    SEMANTIC_CACHE_ENABLED: bool = True
+    SEMANTIC_CACHE_THRESHOLD: float = 0.92
+    SEMANTIC_CACHE_TTL: int = 86400
+
+    # Webhook mode (falls back to polling when disabled - e.g. local dev)
+    USE_WEBHOOK: bool = False
+    WEBHOOK_PORT: int = 8443
+    PUBLIC_URL: str = ""
+    WEBHOOK_SECRET: str = ""
+
+    # Scheduling
+    DAILY_SUITE_HOUR: int = 6  # UTC
+    CRITICAL_INTERVAL_HOURS: int = 6
+    SPOT_CHECK_INTERVAL_HOURS: int = 1
+
+    # Storage
+    DATA_DIR: str = "./data"
+    REPORTS_DIR: str = "./reports"
+
+    @staticmethod
+    def _get_env(env: Dict[str, str], key: str, default: str = "",
+                 fallback_keys: Optional[List[str]] = None) -> str:
+        """Read from an env snapshot with optional fallback keys"""
+        for k in (key, *(fallback_keys or ())):
+            if value := env.get(k):
+                return value
+        return default
+
+    @classmethod
+    def from_env(cls) -> "Config":
+        """Load configuration from environment variables"""
+        # Snapshot once: one os.environ traversal instead of ~25 locked
+        # lookups (matters when Config is rebuilt in tests / hot reload)
+        env = dict(os.environ)
+        test_group = cls._get_env(env, "QA_TEST_GROUP_ID", "0")
+        alert_chat = cls._get_env(env, "ALERT_CHAT_ID", test_group)
+
+        return cls(
+            QA_TELEGRAM_BOT_TOKEN=cls._get_env(
+                env, "QA_TELEGRAM_BOT_TOKEN", fallback_keys=["QA_BOT_TOKEN"]
+            ),
+            QA_TEST_GROUP_ID=int(test_group or "0"),
+            COPILOT_BOT_USERNAME=cls._get_env(env, "COPILOT_BOT_USERNAME").lstrip("@"),
+            GEMINI_API_KEY=cls._get_env(env, "GEMINI_API_KEY", fallback_keys=["QA_GEMINI_API_KEY"]),
+            GEMINI_MODEL=cls._get_env(env, "GEMINI_MODEL", "gemini-3-flash-preview"),
+            COPILOT_API_URL=cls._get_env(env, "COPILOT_API_URL"),
+            COPILOT_API_KEY=cls._get_env(env, "COPILOT_API_KEY"),
+            ALERT_CHAT_ID=int(alert_chat or "0"),
+            RESPONSE_TIMEOUT=int(cls._get_env(env, "RESPONSE_TIMEOUT", "60")),
+            MAX_CONCURRENT_TESTS=int(cls._get_env(env, "MAX_CONCURRENT_TESTS", "4")),
+            SEND_RATE=float(cls._get_env(env, "SEND_RATE", "20")),
+            DAILY_TEST_COUNT=int(cls._get_env(env, "DAILY_TEST_COUNT", "20")),
+            SEMANTIC_CACHE_ENABLED=cls._get_env(env, "SEMANTIC_CACHE_ENABLED", "true").lower()
+            in ("true", "1", "yes"),
+            SEMANTIC_CACHE_THRESHOLD=float(cls._get_env(env, "SEMANTIC_CACHE_THRESHOLD", "0.92")),
+            SEMANTIC_CACHE_TTL=int(cls._get_env(env, "SEMANTIC_CACHE_TTL", "86400")),
+            USE_WEBHOOK=cls._get_env(env, "USE_WEBHOOK", "false").lower() in ("true", "1", "yes"),
+            WEBHOOK_PORT=int(cls._get_env(env, "WEBHOOK_PORT", "8443")),
+            PUBLIC_URL=cls._get_env(env, "PUBLIC_URL").rstrip("/"),
+            WEBHOOK_SECRET=cls._get_env(env, "WEBHOOK_SECRET"),
+            DAILY_SUITE_HOUR=int(cls._get_env(env, "DAILY_SUITE_HOUR", "6")),
+            CRITICAL_INTERVAL_HOURS=int(cls._get_env(env, "CRITICAL_INTERVAL_HOURS", "6")),
+            SPOT_CHECK_INTERVAL_HOURS=int(cls._get_env(env, "SPOT_CHECK_INTERVAL_HOURS", "1")),
+            DATA_DIR=cls._get_env(env, "QA_DATA_DIR", "./data"),
+            REPORTS_DIR=cls._get_env(env, "QA_REPORTS_DIR", "./reports"),
+        )
+
+    def validate(self) -> List[str]:
+        """Validate configuration and return list of errors"""
+        errors = []
+
+        if not self.QA_TELEGRAM_BOT_TOKEN:
+            errors.append("QA_TELEGRAM_BOT_TOKEN is required")
+
+        if not self.QA_TEST_GROUP_ID:
+            errors.append("QA_TEST_GROUP_ID is required")
+
+        if not self.COPILOT_BOT_USERNAME:
+            errors.append("COPILOT_BOT_USERNAME is required")
+
+        if not self.GEMINI_API_KEY:
+            errors.append("GEMINI_API_KEY is required")
+
+        if self.USE_WEBHOOK and not self.PUBLIC_URL:
+            errors.append("PUBLIC_URL is required when USE_WEBHOOK is enabled")
+
+        return errors
+
+
+# Global config instance
+config = Config.from_env()
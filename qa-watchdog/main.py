@@ -0,0 +1,64 @@
+"""
+QA Watchdog entry point
+
+Copyright (c) 2025 DecentralizedJM
+Licensed under MIT License
+"""
+import asyncio
+import logging
+import signal
+import sys
+
+from bot.watchdog import QAWatchdogBot
+from config import config
+from qa_scheduler import setup_qa_scheduler
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+async def async_main():
+    errors = config.validate()
+    if errors:
+        for error in errors:
+            logger.error(f"Config error: {error}")
+        sys.exit(1)
+
+    bot = QAWatchdogBot(config)
+    await bot.start()
+
+    scheduler = setup_qa_scheduler(bot, config)
+    scheduler.start()
+
+    shutdown_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, shutdown_event.set)
+
+    logger.info("QA Watchdog running - waiting for scheduled runs")
+    await shutdown_event.wait()
+
+    scheduler.shutdown(wait=False)
+    await bot.stop()
+
+
+def main():
+    try:
+        # libuv-backed loop: cheaper callback dispatch and timer handling
+        # for the many Event waits and sleeps a suite run creates.
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        logger.info("uvloop not available, using default event loop")
+
+    try:
+        asyncio.run(async_main())
+    except KeyboardInterrupt:
+        logger.info("Interrupted")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""QA test generation, grading and reporting"""
@@ -0,0 +1,609 @@
+"""
+Response Grader - scores copilot answers with keyword checks + Gemini analysis
+
+Copyright (c) 2025 DecentralizedJM
+Licensed under MIT License
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+
+import numpy as np
+from typing import (TYPE_CHECKING, Any, Dict, Final, List, Optional, Set,
+                    Tuple, TypedDict)
+
+from google import genai
+from google.genai import types
+
+from .test_bank import TestCase
+
+if TYPE_CHECKING:
+    from .semantic_cache import SemanticGradeCache
+
+logger = logging.getLogger(__name__)
+
+PASS_THRESHOLD = 7.0
+
+# Error phrasings the copilot emits when it fails, mapped to the concrete
+# issue reported; matched in one precompiled scan so error grading never
+# needs Gemini
+_ERROR_ISSUES = {
+    "something went wrong": "Copilot replied with a generic failure message",
+    "please try again": "Copilot asked the user to retry",
+    "internal error": "Copilot reported an internal error",
+    "temporarily unavailable": "Copilot reported it is temporarily unavailable",
+}
+_ERROR_ISSUE_RE = re.compile("|".join(re.escape(k) for k in _ERROR_ISSUES))
+
+
+def _dict_factory(pairs) -> Dict[str, Any]:
+    """asdict hook: drop private memo fields, render sets as sorted lists"""
+    return {
+        key: sorted(value) if isinstance(value, set) else value
+        for key, value in pairs
+        if not key.startswith("_")
+    }
+
+# Static rubric, byte-identical across calls so Gemini's explicit context
+# cache can reuse its KV state; the per-test question/answer is appended
+# (or sent alone against the cached prefix) by _build_suffix.
+RUBRIC_PREFIX: Final[str] = """You are a QA reviewer for a Mudrex crypto-futures API support bot.
+Score the bot's answer to a developer question.
+
+Rubric (each 0.0-1.0):
+- accuracy: is the technical content correct for the Mudrex API?
+- mudrex_specific: does it answer for Mudrex specifically (not generic exchange advice)?
+- code_quality: if code is shown, is it correct and runnable? (1.0 if no code needed)
+- hallucination_risk: likelihood the answer invents endpoints/params (0.0 = none)
+
+Also list concrete issues and suggestions, and a one-line summary.
+
+Reply with JSON only:
+{"accuracy": 0.0, "mudrex_specific": 0.0, "code_quality": 0.0,
+"hallucination_risk": 0.0, "issues": [], "suggestions": [], "summary": ""}"""
+
+# Dynamic tail of the rubric prompt; a fixed template keeps the bytes
+# deterministic so nothing upstream of the suffix ever perturbs cache hits
+SUFFIX_TMPL: Final[str] = (
+    "Question ({category}): {question}\n\n"
+    "Bot answer:\n{response}"
+)
+
+
+class GradingJSON(TypedDict):
+    """Structured-output schema for the rubric analysis"""
+    accuracy: float
+    mudrex_specific: float
+    code_quality: float
+    hallucination_risk: float
+    issues: List[str]
+    suggestions: List[str]
+    summary: str
+
+
+@dataclass(slots=True)
+class GradeResult:
+    """Grading outcome for one test case (slots: one is allocated per test,
+    and historical trend scans load thousands at once)"""
+    test_case: TestCase
+    response: str
+    response_time: float
+    passed: bool
+    score: float  # 0-10
+    accuracy: float = 0.0
+    mudrex_specific: float = 0.0
+    code_quality: float = 0.0
+    hallucination_risk: float = 0.0
+    keywords_found: Set[str] = field(default_factory=set)
+    keywords_missing: Set[str] = field(default_factory=set)
+    forbidden_found: Set[str] = field(default_factory=set)
+    issues: List[str] = field(default_factory=list)
+    suggestions: List[str] = field(default_factory=list)
+    summary: str = ""
+    message_id: Optional[int] = None
+    timed_out: bool = False
+    graded_at: str = ""  # sampled lazily via graded_at_iso
+    _response_lower: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        # Accept lists (e.g. cached JSON payloads) but store sets for O(1)
+        # membership in score/report generation
+        self.keywords_found = set(self.keywords_found)
+        self.keywords_missing = set(self.keywords_missing)
+        self.forbidden_found = set(self.forbidden_found)
+
+    @property
+    def graded_at_iso(self) -> str:
+        """Grade timestamp, sampled on first access so stub results
+        (timeouts, error grades) that are never reported skip the clock
+        sample and ISO formatting entirely"""
+        if not self.graded_at:
+            self.graded_at = datetime.now().isoformat()
+        return self.graded_at
+
+    @property
+    def response_lower(self) -> str:
+        """Lowercased response, computed once however often it is scanned"""
+        if self._response_lower is None:
+            self._response_lower = self.response.lower()
+        return self._response_lower
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Sample the lazy timestamp so the snapshot carries a real value
+        self.graded_at = self.graded_at_iso
+        return asdict(self, dict_factory=_dict_factory)
+
+
+@dataclass(slots=True)
+class DailySummary:
+    """Aggregated results for one suite run"""
+    date: str
+    total_tests: int
+    passed: int
+    failed: int
+    pass_rate: float
+    avg_response_time: float
+    category_stats: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    failed_tests: List[GradeResult] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        for result in self.failed_tests:
+            result.graded_at = result.graded_at_iso
+        return asdict(self, dict_factory=_dict_factory)
+
+
+class ResponseGrader:
+    """Grades copilot responses: cheap keyword checks first, then Gemini for nuance"""
+
+    def __init__(self, api_key: str, model: str = "gemini-3-flash-preview",
+                 semantic_cache: Optional["SemanticGradeCache"] = None):
+        self.client = genai.Client(api_key=api_key)
+        self.model = model
+        # Optional embedding-similarity cache of rubric analyses; hits skip
+        # the Gemini call (safe: grading runs at temperature 0)
+        self.semantic_cache = semantic_cache
+        # Explicit context cache for the static rubric prefix; when present,
+        # per-call prompts carry only the small dynamic suffix
+        self._cached_prefix: Optional[str] = None
+        self._ensure_prefix_cache()
+        # Per-test-case compiled keyword matchers (test id -> matcher tuple);
+        # one linear scan of the response instead of one pass per keyword
+        self._keyword_matchers: Dict[str, tuple] = {}
+        # Exact-match memo of analyses within one QA cycle, keyed on a
+        # digest of the prompt bytes; dedupes retries and identical pairs
+        self._run_cache: Dict[bytes, Dict[str, Any]] = {}
+
+    def clear_run_cache(self):
+        """Reset the per-run analysis memo (call at the start of each cycle)"""
+        self._run_cache.clear()
+
+    @staticmethod
+    def _run_key(suffix: str) -> bytes:
+        return hashlib.blake2b(suffix.encode(), digest_size=16).digest()
+
+    def _ensure_prefix_cache(self):
+        """Create (or recreate) the cached rubric prefix; best-effort"""
+        try:
+            cache = self.client.caches.create(
+                model=self.model,
+                config=types.CreateCachedContentConfig(
+                    contents=[RUBRIC_PREFIX], ttl="3600s"
+                ),
+            )
+            self._cached_prefix = cache.name
+        except Exception as e:
+            self._cached_prefix = None
+            logger.debug(f"Rubric prefix cache unavailable, inlining rubric: {e}")
+
+    def grade(self, test_case: TestCase, response: str, response_time: float,
+              message_id: Optional[int] = None) -> GradeResult:
+        """Full grade: keyword checks + Gemini rubric analysis"""
+        keywords_found, keywords_missing, forbidden_found = self._check_keywords(
+            test_case, response
+        )
+
+        analysis = self._gemini_analysis(test_case, response)
+
+        return self._build_result(
+            test_case, response, response_time, message_id, analysis,
+            keywords_found, keywords_missing, forbidden_found,
+        )
+
+    async def grade_async(self, test_case: TestCase, response: str,
+                          response_time: float,
+                          message_id: Optional[int] = None) -> GradeResult:
+        """Async grade() for callers already inside the event loop"""
+        keywords_found, keywords_missing, forbidden_found = self._check_keywords(
+            test_case, response
+        )
+        analysis = await self._gemini_analysis_async(test_case, response)
+        return self._build_result(
+            test_case, response, response_time, message_id, analysis,
+            keywords_found, keywords_missing, forbidden_found,
+        )
+
+    async def grade_many(self, cases: List[Tuple[TestCase, str, float, Optional[int]]],
+                         max_concurrency: int = 8) -> List[GradeResult]:
+        """Grade many cases concurrently, bounded by the RPM budget"""
+        sem = asyncio.Semaphore(max_concurrency)
+
+        async def bounded(tc: TestCase, resp: str, rt: float, mid: Optional[int]):
+            async with sem:
+                return await self.grade_async(tc, resp, rt, mid)
+
+        return list(await asyncio.gather(*(bounded(*case) for case in cases)))
+
+    def grade_batch(self, cases: List[Tuple[TestCase, str, float, Optional[int]]],
+                    poll_interval: float = 10.0,
+                    timeout: float = 1800.0) -> List[GradeResult]:
+        """Grade many (test_case, response, response_time, message_id) tuples at once.
+
+        Submits all rubric prompts as one Gemini batch job (cheaper tokens,
+        one poll cycle instead of N round-trips). Falls back to the serial
+        single-call path if the batch job fails, so callers that need low
+        latency (critical tests) can keep using grade() directly.
+        """
+        if not cases:
+            return []
+        try:
+            analyses = self._batch_analysis(cases, poll_interval, timeout)
+        except Exception as e:
+            logger.warning(f"Batch grading failed, falling back to serial: {e}")
+            return [self.grade(tc, resp, rt, mid) for tc, resp, rt, mid in cases]
+
+        results = []
+        for test_case, response, response_time, message_id in cases:
+            analysis = analyses.get(test_case.id) or self._neutral_analysis()
+            keywords_found, keywords_missing, forbidden_found = self._check_keywords(
+                test_case, response
+            )
+            results.append(
+                self._build_result(
+                    test_case, response, response_time, message_id, analysis,
+                    keywords_found, keywords_missing, forbidden_found,
+                )
+            )
+        return results
+
+    def _build_result(self, test_case: TestCase, response: str,
+                      response_time: float, message_id: Optional[int],
+                      analysis: Dict[str, Any], keywords_found: Set[str],
+                      keywords_missing: Set[str],
+                      forbidden_found: Set[str]) -> GradeResult:
+        """Assemble a GradeResult from an analysis dict + keyword checks"""
+        score = self._calculate_score(
+            analysis, keywords_found, keywords_missing, forbidden_found, test_case
+        )
+        return GradeResult(
+            test_case=test_case,
+            response=response,
+            response_time=response_time,
+            passed=score >= PASS_THRESHOLD and not forbidden_found,
+            score=score,
+            accuracy=analysis.get("accuracy", 0.5),
+            mudrex_specific=analysis.get("mudrex_specific", 0.5),
+            code_quality=analysis.get("code_quality", 0.5),
+            hallucination_risk=analysis.get("hallucination_risk", 0.5),
+            keywords_found=keywords_found,
+            keywords_missing=keywords_missing,
+            forbidden_found=forbidden_found,
+            issues=analysis.get("issues", []),
+            suggestions=analysis.get("suggestions", []),
+            summary=analysis.get("summary", ""),
+            message_id=message_id,
+        )
+
+    def grade_timeout(self, test_case: TestCase, timeout: float) -> GradeResult:
+        """Grade for a test that got no response within the timeout"""
+        return GradeResult(
+            test_case=test_case,
+            response="",
+            response_time=timeout,
+            passed=False,
+            score=0.0,
+            issues=[f"No response within {timeout}s"],
+            summary="Copilot did not respond before the timeout",
+            timed_out=True,
+        )
+
+    def grade_error_response(self, test_case: TestCase, response: str,
+                             response_time: float) -> GradeResult:
+        """Grade for a response that looks like an error message from the copilot.
+
+        Pure local fast path: an error message is an automatic fail, so there
+        is nothing for Gemini to judge - one precompiled scan maps the
+        matched error phrasings to concrete issues.
+        """
+        result = GradeResult(
+            test_case=test_case,
+            response=response,
+            response_time=response_time,
+            passed=False,
+            score=0.0,
+            issues=["Copilot returned an error message instead of an answer"],
+            summary="Copilot errored out",
+        )
+        # Scan the memoized lowercase so later consumers reuse it for free
+        matched = set(_ERROR_ISSUE_RE.findall(result.response_lower))
+        result.issues.extend(_ERROR_ISSUES[m] for m in sorted(matched))
+        return result
+
+    def _keyword_matcher(self, test_case: TestCase) -> tuple:
+        """Memoized (pattern, expected, forbidden) matcher for one test case"""
+        cached = self._keyword_matchers.get(test_case.id)
+        if cached is None:
+            expected = tuple(test_case.expected_keywords)
+            forbidden = tuple(test_case.forbidden_keywords)
+            needles = {k.lower() for k in (*expected, *forbidden)}
+            pattern = None
+            if needles:
+                # Longest alternatives first so "orders" isn't shadowed by "order"
+                pattern = re.compile(
+                    "|".join(
+                        re.escape(k) for k in sorted(needles, key=len, reverse=True)
+                    ),
+                    re.IGNORECASE,
+                )
+            cached = (pattern, expected, forbidden)
+            self._keyword_matchers[test_case.id] = cached
+        return cached
+
+    def _check_keywords(self, test_case: TestCase, response: str):
+        """Check expected/forbidden keywords in one pass (case-insensitive)"""
+        pattern, expected, forbidden = self._keyword_matcher(test_case)
+        if pattern is None:
+            return [], [], []
+
+        hits = {m.lower() for m in pattern.findall(response)}
+        keywords_found = {k for k in expected if k.lower() in hits}
+        keywords_missing = {k for k in expected if k.lower() not in hits}
+        forbidden_found = {k for k in forbidden if k.lower() in hits}
+        return keywords_found, keywords_missing, forbidden_found
+
+    @staticmethod
+    def _build_suffix(test_case: TestCase, response: str) -> str:
+        """The small dynamic tail that follows the cached rubric prefix"""
+        return SUFFIX_TMPL.format_map({
+            "category": test_case.category,
+            "question": test_case.question,
+            "response": response,
+        })
+
+    def _build_prompt(self, test_case: TestCase, response: str) -> str:
+        """Full rubric prompt (used when no prefix cache is available)"""
+        return f"{RUBRIC_PREFIX}\n\n{self._build_suffix(test_case, response)}"
+
+    def _analysis_config(self, cached_content: Optional[str] = None
+                         ) -> types.GenerateContentConfig:
+        """Structured-output config: the SDK returns parsed GradingJSON directly"""
+        return types.GenerateContentConfig(
+            temperature=0.0,
+            max_output_tokens=1000,
+            response_mime_type="application/json",
+            response_schema=GradingJSON,
+            cached_content=cached_content,
+        )
+
+    @staticmethod
+    def _neutral_analysis() -> Dict[str, Any]:
+        """Neutral scores used when Gemini analysis is unavailable"""
+        return {
+            "accuracy": 0.5,
+            "mudrex_specific": 0.5,
+            "code_quality": 0.5,
+            "hallucination_risk": 0.5,
+            "issues": [],
+            "suggestions": [],
+            "summary": "Gemini analysis unavailable",
+        }
+
+    def _gemini_analysis(self, test_case: TestCase, response: str) -> Dict[str, Any]:
+        """Ask Gemini to score the response against the QA rubric"""
+        run_key = self._run_key(self._build_suffix(test_case, response))
+        memoized = self._run_cache.get(run_key)
+        if memoized is not None:
+            return memoized
+        cache_key = None
+        if self.semantic_cache is not None:
+            cache_key = self.semantic_cache.make_text(test_case.question, response)
+            cached = self.semantic_cache.get(cache_key)
+            if cached is not None:
+                self._run_cache[run_key] = cached
+                return cached
+        try:
+            if self._cached_prefix:
+                try:
+                    result = self.client.models.generate_content(
+                        model=self.model,
+                        contents=self._build_suffix(test_case, response),
+                        config=self._analysis_config(cached_content=self._cached_prefix),
+                    )
+                except Exception:
+                    # Cached content likely expired; fall back to the full
+                    # prompt for this call and recreate the prefix cache
+                    self._ensure_prefix_cache()
+                    result = self.client.models.generate_content(
+                        model=self.model,
+                        contents=self._build_prompt(test_case, response),
+                        config=self._analysis_config(),
+                    )
+            else:
+                result = self.client.models.generate_content(
+                    model=self.model,
+                    contents=self._build_prompt(test_case, response),
+                    config=self._analysis_config(),
+                )
+            # Structured output: parsed by the SDK, no fence stripping needed
+            analysis = result.parsed or json.loads(result.text)
+            self._run_cache[run_key] = analysis
+            if cache_key is not None:
+                self.semantic_cache.set(cache_key, analysis)
+            return analysis
+        except Exception as e:
+            logger.warning(f"Gemini analysis failed, using neutral scores: {e}")
+            return self._neutral_analysis()
+
+    async def _gemini_analysis_async(self, test_case: TestCase,
+                                     response: str) -> Dict[str, Any]:
+        """Async rubric analysis with exponential backoff on rate limits"""
+        run_key = self._run_key(self._build_suffix(test_case, response))
+        memoized = self._run_cache.get(run_key)
+        if memoized is not None:
+            return memoized
+        cache_key = None
+        if self.semantic_cache is not None:
+            cache_key = self.semantic_cache.make_text(test_case.question, response)
+            cached = await asyncio.to_thread(self.semantic_cache.get, cache_key)
+            if cached is not None:
+                self._run_cache[run_key] = cached
+                return cached
+
+        delay = 1.0
+        for attempt in range(3):
+            if self._cached_prefix:
+                contents = self._build_suffix(test_case, response)
+                config = self._analysis_config(cached_content=self._cached_prefix)
+            else:
+                contents = self._build_prompt(test_case, response)
+                config = self._analysis_config()
+            try:
+                result = await self.client.aio.models.generate_content(
+                    model=self.model, contents=contents, config=config
+                )
+                analysis = result.parsed or json.loads(result.text)
+                self._run_cache[run_key] = analysis
+                if cache_key is not None:
+                    await asyncio.to_thread(
+                        self.semantic_cache.set, cache_key, analysis
+                    )
+                return analysis
+            except Exception as e:
+                text = str(e)
+                if "429" in text or "RESOURCE_EXHAUSTED" in text:
+                    if attempt < 2:
+                        await asyncio.sleep(delay)
+                        delay *= 2
+                        continue
+                elif self._cached_prefix:
+                    # Cached prefix may have expired; recreate and retry
+                    await asyncio.to_thread(self._ensure_prefix_cache)
+                    continue
+                logger.warning(f"Gemini analysis failed, using neutral scores: {e}")
+                break
+        return self._neutral_analysis()
+
+    def _batch_analysis(self, cases: List[Tuple[TestCase, str, float, Optional[int]]],
+                        poll_interval: float, timeout: float) -> Dict[str, Dict[str, Any]]:
+        """Run all rubric prompts through one Gemini batch job, keyed by test id"""
+        lines = []
+        for test_case, response, _, _ in cases:
+            lines.append(json.dumps({
+                "key": test_case.id,
+                "request": {
+                    "contents": [
+                        {"parts": [{"text": self._build_prompt(test_case, response)}]}
+                    ],
+                    "generation_config": {
+                        "temperature": 0.0,
+                        "max_output_tokens": 1000,
+                        "response_mime_type": "application/json",
+                    },
+                },
+            }))
+
+        fd, path = tempfile.mkstemp(suffix=".jsonl")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write("\n".join(lines))
+            uploaded = self.client.files.upload(
+                file=path, config={"mime_type": "application/jsonl"}
+            )
+            job = self.client.batches.create(
+                model=self.model, src=uploaded.name
+            )
+            deadline = time.monotonic() + timeout
+            terminal = ("JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED")
+            while job.state.name not in terminal:
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Batch job {job.name} still running after {timeout}s")
+                time.sleep(poll_interval)
+                job = self.client.batches.get(name=job.name)
+            if job.state.name != "JOB_STATE_SUCCEEDED":
+                raise RuntimeError(f"Batch job {job.name} ended in {job.state.name}")
+
+            content = self.client.files.download(file=job.dest.file_name)
+            analyses: Dict[str, Dict[str, Any]] = {}
+            for line in content.decode("utf-8").splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    data = json.loads(line)
+                    text = data["response"]["candidates"][0]["content"]["parts"][0]["text"]
+                    analyses[data["key"]] = json.loads(text)
+                except Exception as e:
+                    logger.warning(f"Could not parse batch result line: {e}")
+            logger.info(f"Batch graded {len(analyses)}/{len(cases)} cases")
+            return analyses
+        finally:
+            os.unlink(path)
+
+    def _calculate_score(self, analysis: Dict[str, Any], keywords_found: Set[str],
+                         keywords_missing: Set[str], forbidden_found: Set[str],
+                         test_case: TestCase) -> float:
+        """Blend rubric scores and keyword coverage into a 0-10 score"""
+        rubric = (
+            analysis.get("accuracy", 0.5) * 4.0
+            + analysis.get("mudrex_specific", 0.5) * 2.0
+            + analysis.get("code_quality", 0.5) * 2.0
+            + (1.0 - analysis.get("hallucination_risk", 0.5)) * 2.0
+        )
+
+        total_keywords = len(keywords_found) + len(keywords_missing)
+        if total_keywords:
+            coverage = len(keywords_found) / total_keywords
+            rubric = rubric * 0.8 + coverage * 10 * 0.2
+
+        if forbidden_found:
+            rubric = min(rubric, 3.0)
+
+        return round(rubric, 2)
+
+    @staticmethod
+    def score_batch(accuracy, mudrex_specific, code_quality, hallucination_risk,
+                    kw_found, kw_total, forbidden_count) -> np.ndarray:
+        """Vectorized _calculate_score over arrays of archived results.
+
+        Used for historical reprocessing (e.g. pass-threshold sweeps over
+        saved runs) where a Python loop per result would dominate. Applies
+        the exact same piecewise formula as the scalar path.
+        """
+        accuracy = np.asarray(accuracy, dtype=np.float64)
+        mudrex_specific = np.asarray(mudrex_specific, dtype=np.float64)
+        code_quality = np.asarray(code_quality, dtype=np.float64)
+        hallucination_risk = np.asarray(hallucination_risk, dtype=np.float64)
+        kw_found = np.asarray(kw_found, dtype=np.float64)
+        kw_total = np.asarray(kw_total, dtype=np.float64)
+        forbidden_count = np.asarray(forbidden_count)
+
+        rubric = (
+            accuracy * 4.0
+            + mudrex_specific * 2.0
+            + code_quality * 2.0
+            + (1.0 - hallucination_risk) * 2.0
+        )
+        has_kw = kw_total > 0
+        coverage = np.divide(
+            kw_found, kw_total, out=np.zeros_like(rubric), where=has_kw
+        )
+        rubric = np.where(has_kw, rubric * 0.8 + coverage * 10 * 0.2, rubric)
+        rubric = np.where(forbidden_count > 0, np.minimum(rubric, 3.0), rubric)
+        return np.round(rubric, 2)
@@ -0,0 +1,118 @@
+"""
+Grader Cache - exact-match cache for deterministic Gemini grading calls
+
+Keyed on sha256 of (question, response, model); a hit skips the grader's
+Gemini call entirely. Safe because grading runs at temperature 0.
+
+Copyright (c) 2025 DecentralizedJM
+Licensed under MIT License
+"""
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Protocol
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(Protocol):
+    """Minimal key-value backend with TTL"""
+
+    def get(self, key: str) -> Optional[str]: ...
+
+    def set(self, key: str, value: str, ttl_seconds: int): ...
+
+
+class MemoryBackend:
+    """In-process backend (lost on restart)"""
+
+    def __init__(self):
+        self._data: Dict[str, tuple] = {}  # key -> (expires_at, value)
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.time() > expires_at:
+            self._data.pop(key, None)
+            return None
+        return value
+
+    def set(self, key: str, value: str, ttl_seconds: int):
+        self._data[key] = (time.time() + ttl_seconds, value)
+
+
+class FileBackend:
+    """One JSON file per key under cache_dir (survives restarts)"""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            if not path.exists():
+                return None
+            data = json.loads(path.read_text())
+            if time.time() > data["expires_at"]:
+                path.unlink(missing_ok=True)
+                return None
+            return data["value"]
+        except Exception as e:
+            logger.debug(f"Grader cache read failed for {key[:12]}: {e}")
+            return None
+
+    def set(self, key: str, value: str, ttl_seconds: int):
+        try:
+            self._path(key).write_text(
+                json.dumps({"expires_at": time.time() + ttl_seconds, "value": value})
+            )
+        except Exception as e:
+            logger.warning(f"Grader cache write failed for {key[:12]}: {e}")
+
+
+class GraderCache:
+    """Exact-match (question, response) -> grade payload cache"""
+
+    def __init__(self, backend: CacheBackend, model: str,
+                 ttl_seconds: int = 86400 * 7):
+        self.backend = backend
+        self.model = model
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, question: str, response: str) -> str:
+        payload = json.dumps(
+            {"question": question, "response": response, "model": self.model},
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, question: str, response: str) -> Optional[Dict[str, Any]]:
+        value = self.backend.get(self.make_key(question, response))
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(value)
+
+    def set(self, question: str, response: str, payload: Dict[str, Any]):
+        self.backend.set(
+            self.make_key(question, response), json.dumps(payload), self.ttl_seconds
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
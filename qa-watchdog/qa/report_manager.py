@@ -0,0 +1,200 @@
+"""
+Report Manager - writes failure reports and daily summaries to disk
+
+Copyright (c) 2025 DecentralizedJM
+Licensed under MIT License
+"""
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from .grader import DailySummary, GradeResult
+
+try:
+    import orjson
+except ImportError:  # optional - stdlib json does the same, slower
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _dumps_pretty(payload) -> str:
+    """Indented, key-sorted JSON via orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(
+            payload, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+        ).decode()
+    return json.dumps(payload, indent=2, sort_keys=True)
+
+# Trigger tokens scanned once per issue when aggregating recommendations
+_TRIGGER_RE = re.compile(r"timeout|hallucin|docs")
+
+
+class ReportManager:
+    """Persists detailed markdown reports for failures and JSON daily summaries"""
+
+    def __init__(self, reports_dir: str = "./reports"):
+        self.reports_dir = Path(reports_dir)
+        self.reports_dir.mkdir(parents=True, exist_ok=True)
+        # Disk writes go through a bounded queue drained by a daemon thread
+        # so grading never blocks on report I/O
+        self._write_queue: "queue.Queue[Tuple[Path, str]]" = queue.Queue(maxsize=256)
+        self._writer = threading.Thread(
+            target=self._writer_loop, daemon=True, name="report-writer"
+        )
+        self._writer.start()
+
+    def _writer_loop(self):
+        while True:
+            path, text = self._write_queue.get()
+            try:
+                path.write_text(text)
+                logger.info(f"Saved report: {path.name}")
+            except Exception as e:
+                logger.warning(f"Report write failed for {path.name}: {e}")
+            finally:
+                self._write_queue.task_done()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until queued writes hit disk (shutdown and tests)"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while self._write_queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def save_report(self, result: GradeResult) -> Path:
+        """Queue a detailed markdown report for a failed test, return its path"""
+        date = datetime.now().strftime("%Y-%m-%d")
+        filename = f"{date}_{result.test_case.id}_{result.test_case.unique_hash}.md"
+        path = self.reports_dir / filename
+        self._write_queue.put((path, self._format_detailed_report(result)))
+        return path
+
+    def save_daily_summary(self, summary: DailySummary) -> Path:
+        """Queue the daily summary JSON, return its path"""
+        path = self.reports_dir / f"{summary.date}_daily_summary.json"
+        payload = summary.to_dict()
+        recommendations = self._generate_recommendations(summary.failed_tests)
+        if recommendations:
+            payload["recommendations"] = recommendations
+        self._write_queue.put((path, _dumps_pretty(payload)))
+        return path
+
+    def get_recent_failures(self, days: int = 1) -> List[Path]:
+        """Failure reports written in the last `days` days (newest first)"""
+        # Filenames start with YYYY-MM-DD, so a lexicographic compare on the
+        # prefix matches date order - no strptime per file; scandir avoids
+        # glob's extra stat per entry
+        cutoff_str = (datetime.now() - timedelta(days=days + 1)).strftime("%Y-%m-%d")
+        recent = []
+        with os.scandir(self.reports_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if (
+                    name.endswith(".md")
+                    and name[:4].isdigit()
+                    and name[:10] >= cutoff_str
+                ):
+                    recent.append(self.reports_dir / name)
+        return sorted(recent, key=lambda p: p.name, reverse=True)
+
+    def _format_detailed_report(self, result: GradeResult) -> str:
+        """Build the markdown body for a failure report"""
+        parts = [
+            f"# QA Failure: {result.test_case.id}\n\n",
+            f"- **Date**: {result.graded_at_iso}\n",
+            f"- **Category**: {result.test_case.category}\n",
+            f"- **Severity**: {result.test_case.severity}\n",
+            f"- **Score**: {result.score}/10\n",
+            f"- **Response time**: {result.response_time:.1f}s\n",
+        ]
+        if result.timed_out:
+            parts.append("- **Timed out**: yes\n")
+        parts.append("\n## Question\n\n")
+        parts.append(f"{result.test_case.question}\n")
+        parts.append("\n## Response\n\n")
+        parts.append(f"{result.response or '(no response)'}\n")
+        parts.append("\n## Grading\n\n```json\n")
+        parts.append(
+            _dumps_pretty(
+                {
+                    "accuracy": result.accuracy,
+                    "mudrex_specific": result.mudrex_specific,
+                    "code_quality": result.code_quality,
+                    "hallucination_risk": result.hallucination_risk,
+                    "keywords_found": sorted(result.keywords_found),
+                    "keywords_missing": sorted(result.keywords_missing),
+                    "forbidden_found": sorted(result.forbidden_found),
+                }
+            )
+        )
+        parts.append("\n```\n")
+        if result.issues:
+            parts.append("\n## Issues\n\n")
+            parts.extend(f"- {issue}\n" for issue in result.issues)
+        if result.suggestions:
+            parts.append("\n## Suggestions\n\n")
+            parts.extend(f"- {suggestion}\n" for suggestion in result.suggestions)
+        parts.append("\n## Action items\n\n")
+        parts.extend(f"- [ ] {item}\n" for item in self._generate_action_items(result))
+        suggestions = self._get_file_suggestions(result)
+        if suggestions:
+            parts.append("\n## Likely docs to check\n\n")
+            parts.extend(f"- `{doc}`\n" for doc in suggestions)
+        return "".join(parts)
+
+    def _generate_action_items(self, result: GradeResult) -> List[str]:
+        """Turn grading signals into concrete follow-ups"""
+        items = []
+        if result.timed_out:
+            items.append("Check copilot logs for hangs or rate limiting")
+        if result.keywords_missing:
+            items.append(
+                f"Verify docs cover: {', '.join(sorted(result.keywords_missing))}"
+            )
+        if result.forbidden_found:
+            items.append(
+                f"Response leaked forbidden terms: {', '.join(sorted(result.forbidden_found))}"
+            )
+        if result.hallucination_risk > 0.5:
+            items.append("Review response for invented endpoints/parameters")
+        if not items:
+            items.append("Review the response manually")
+        return items
+
+    def _get_file_suggestions(self, result: GradeResult) -> List[str]:
+        """Map the failed category to docs files worth re-checking"""
+        mapping = {
+            "auth": ["docs/authentication.md"],
+            "error_log": ["docs/errors.md"],
+            "order": ["docs/orders.md"],
+            "position": ["docs/positions.md"],
+        }
+        return mapping.get(result.test_case.category, [])
+
+    def _generate_recommendations(self, failures: List[GradeResult]) -> List[str]:
+        """Aggregate failure issues into top-level recommendations"""
+        counts: Counter = Counter()
+        for result in failures:
+            # Timeout grades say "No response within Ns", so count the flag
+            counts["timeout"] += result.timed_out
+            for issue in result.issues:
+                counts.update(_TRIGGER_RE.findall(issue.lower()))
+        recommendations = []
+        if counts["timeout"] >= 2:
+            recommendations.append("Multiple timeouts - check copilot responsiveness")
+        if counts["hallucin"] >= 2:
+            recommendations.append("Repeated hallucinations - review RAG retrieval quality")
+        if counts["docs"] >= 2:
+            recommendations.append("Docs gaps reported - audit documentation coverage")
+        return recommendations
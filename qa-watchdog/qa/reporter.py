@@ -0,0 +1,99 @@
+"""
+Reporter - formats Telegram alerts and summaries
+
+Copyright (c) 2025 DecentralizedJM
+Licensed under MIT License
+"""
+import logging
+import re
+from pathlib import Path
+from typing import List, Optional
+
+from .grader import DailySummary, GradeResult
+
+logger = logging.getLogger(__name__)
+
+# MarkdownV2 special characters, escaped in one compiled substitution
+# instead of 18 sequential str.replace passes per interpolated field
+_MD_ESCAPE_RE = re.compile(r"([_*\[\]()~`>#+\-=|{}.!])")
+
+
+class Reporter:
+    """Formats grading results for Telegram (MarkdownV2)"""
+
+    def _escape_markdown(self, text: str) -> str:
+        """Escape MarkdownV2 special characters"""
+        return _MD_ESCAPE_RE.sub(r"\\\1", text)
+
+    def format_failure_alert(self, result: GradeResult,
+                             report_path: Optional[Path] = None) -> str:
+        """Alert message for a single failed test"""
+        parts = [
+            "🚨 *QA Test Failed*\n\n",
+            f"Test: `{result.test_case.id}` \\({self._escape_markdown(result.test_case.category)}\\)\n",
+            f"Score: {self._escape_markdown(str(result.score))}/10\n",
+            f"Q: {self._escape_markdown(result.test_case.question[:120])}\n",
+        ]
+        if result.summary:
+            parts.append(f"\n{self._escape_markdown(result.summary)}\n")
+        if result.issues:
+            parts.append("\nIssues:\n")
+            parts.extend(
+                f"• {self._escape_markdown(issue)}\n" for issue in result.issues[:3]
+            )
+        if report_path:
+            parts.append(f"\nReport: `{self._escape_markdown(report_path.name)}`")
+        return "".join(parts)
+
+    def format_failure_digest(self, failures: List[GradeResult]) -> str:
+        """One combined alert for several failures (fits Telegram's 4096 limit)"""
+        if len(failures) == 1 and not failures[0].timed_out:
+            return self.format_failure_alert(failures[0])
+        parts = [f"🚨 *{len(failures)} QA test\\(s\\) failed*\n\n"]
+        length = len(parts[0])
+        for result in failures:
+            if result.timed_out:
+                detail = "⏱ timed out"
+            else:
+                detail = f"{self._escape_markdown(str(result.score))}/10"
+                if result.summary:
+                    detail += f" \\- {self._escape_markdown(result.summary[:80])}"
+            line = f"• `{result.test_case.id}` {detail}\n"
+            if length + len(line) > 4000:
+                parts.append("…\n")
+                break
+            parts.append(line)
+            length += len(line)
+        return "".join(parts)
+
+    def format_timeout_alert(self, result: GradeResult) -> str:
+        """Alert message for a timed-out test"""
+        return (
+            "⏱ *QA Test Timed Out*\n\n"
+            f"Test: `{result.test_case.id}`\n"
+            f"Q: {self._escape_markdown(result.test_case.question[:120])}\n"
+            f"No response in {self._escape_markdown(str(result.response_time))}s"
+        )
+
+    def format_daily_summary(self, summary: DailySummary) -> str:
+        """Daily summary message"""
+        emoji = "✅" if summary.pass_rate >= 0.9 else "⚠️" if summary.pass_rate >= 0.7 else "🚨"
+        parts = [
+            f"{emoji} *Daily QA Summary* \\({self._escape_markdown(summary.date)}\\)\n\n",
+            f"Passed: {summary.passed}/{summary.total_tests} ",
+            f"\\({self._escape_markdown(f'{summary.pass_rate:.0%}')}\\)\n",
+            f"Avg response: {self._escape_markdown(f'{summary.avg_response_time:.1f}')}s\n",
+        ]
+        if summary.category_stats:
+            parts.append("\nBy category:\n")
+            parts.extend(
+                f"• {self._escape_markdown(category)}: "
+                f"{stats['passed']}/{stats['total']}\n"
+                for category, stats in summary.category_stats.items()
+            )
+        if summary.failed_tests:
+            parts.append("\nFailed:\n")
+            parts.extend(
+                f"• `{result.test_case.id}`\n" for result in summary.failed_tests[:5]
+            )
+        return "".join(parts)
@@ -0,0 +1,191 @@
+"""
+Semantic Cache - skip copilot round-trips for paraphrased test questions
+
+Keyed on Gemini embeddings of the question (same approach as the copilot's
+own semantic cache); a hit returns the cached answer and grade so neither
+the copilot nor the grader is called.
+
+Copyright (c) 2025 DecentralizedJM
+Licensed under MIT License
+"""
+import logging
+import pickle
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from google import genai
+
+logger = logging.getLogger(__name__)
+
+
+class QASemanticCache:
+    """Embedding-similarity cache of (question -> answer, response_time, grade)"""
+
+    def __init__(self, api_key: str, data_dir: str = "./data",
+                 threshold: float = 0.92, ttl_seconds: int = 86400,
+                 max_entries: int = 10000,
+                 embedding_model: str = "gemini-embedding-001",
+                 cache_name: str = "qa_semantic_cache.pkl"):
+        self.client = genai.Client(api_key=api_key)
+        self.embedding_model = embedding_model
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self.cache_file = Path(data_dir) / cache_name
+        # Parallel structures: one row in the matrix per entry
+        self.entries: List[Dict[str, Any]] = []
+        self.matrix: Optional[np.ndarray] = None  # (n, dims) L2-normalized
+
+        # Memo of question -> normalized embedding, filled by prewarm so
+        # per-test get() calls don't each pay a single-item embed round-trip
+        self._query_embeddings: Dict[str, np.ndarray] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _load(self):
+        try:
+            if self.cache_file.exists():
+                with open(self.cache_file, "rb") as f:
+                    data = pickle.load(f)
+                self.entries = data.get("entries", [])
+                matrix = data.get("matrix")
+                self.matrix = matrix if matrix is not None and len(matrix) else None
+                logger.info(f"Loaded {len(self.entries)} semantic cache entries")
+        except Exception as e:
+            logger.warning(f"Could not load QA semantic cache: {e}")
+            self.entries = []
+            self.matrix = None
+
+    def _save(self):
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_file, "wb") as f:
+                pickle.dump({"entries": self.entries, "matrix": self.matrix}, f)
+        except Exception as e:
+            logger.warning(f"Could not save QA semantic cache: {e}")
+
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        memoized = self._query_embeddings.get(text)
+        if memoized is not None:
+            return memoized
+        try:
+            result = self.client.models.embed_content(
+                model=self.embedding_model,
+                contents=text,
+            )
+            vec = np.asarray(result.embeddings[0].values, dtype=np.float32)
+            norm = np.linalg.norm(vec)
+            vec = vec / norm if norm else vec
+            self._query_embeddings[text] = vec
+            return vec
+        except Exception as e:
+            logger.warning(f"Embedding failed, semantic cache bypassed: {e}")
+            return None
+
+    def prewarm_embeddings(self, questions: List[str]):
+        """Batch-embed a suite's questions in one API call instead of N"""
+        todo = [q for q in set(questions) if q not in self._query_embeddings]
+        if not todo:
+            return
+        try:
+            result = self.client.models.embed_content(
+                model=self.embedding_model,
+                contents=todo,
+            )
+            for question, emb in zip(todo, result.embeddings):
+                vec = np.asarray(emb.values, dtype=np.float32)
+                norm = np.linalg.norm(vec)
+                self._query_embeddings[question] = vec / norm if norm else vec
+            logger.info(f"Prewarmed {len(todo)} question embeddings")
+        except Exception as e:
+            logger.warning(f"Embedding prewarm failed (will embed on demand): {e}")
+
+    def get(self, question: str) -> Optional[Dict[str, Any]]:
+        """Return the cached payload for a semantically-equivalent question"""
+        if self.matrix is None or not self.entries:
+            self.misses += 1
+            return None
+        query = self._embed(question)
+        if query is None:
+            self.misses += 1
+            return None
+
+        # One vectorized cosine pass over all entries (rows are normalized)
+        sims = self.matrix @ query
+        best = int(np.argmax(sims))
+        if sims[best] < self.threshold:
+            self.misses += 1
+            return None
+
+        entry = self.entries[best]
+        if time.time() - entry["cached_at"] > self.ttl_seconds:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        logger.info(
+            f"Semantic cache hit ({sims[best]:.3f}) for: {question[:60]}"
+        )
+        return entry["payload"]
+
+    def set(self, question: str, payload: Dict[str, Any]):
+        """Cache the payload (answer, response_time, grade) for a question"""
+        vec = self._embed(question)
+        if vec is None:
+            return
+        self.entries.append(
+            {"question": question, "payload": payload, "cached_at": time.time()}
+        )
+        if self.matrix is None:
+            self.matrix = vec[np.newaxis, :]
+        else:
+            self.matrix = np.vstack([self.matrix, vec])
+
+        # LRU-ish eviction: drop oldest entries beyond the cap
+        if len(self.entries) > self.max_entries:
+            excess = len(self.entries) - self.max_entries
+            self.entries = self.entries[excess:]
+            self.matrix = self.matrix[excess:]
+        self._save()
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+class SemanticGradeCache(QASemanticCache):
+    """Embedding-similarity cache of (question + response -> grading analysis)
+
+    Copilot regression runs produce near-identical answers across days; a
+    hit above the (stricter) threshold reuses the stored rubric analysis so
+    the grader's Gemini call is skipped entirely.
+    """
+
+    def __init__(self, api_key: str, data_dir: str = "./data",
+                 threshold: float = 0.95, ttl_seconds: int = 86400 * 7,
+                 max_entries: int = 10000,
+                 embedding_model: str = "gemini-embedding-001"):
+        super().__init__(
+            api_key,
+            data_dir=data_dir,
+            threshold=threshold,
+            ttl_seconds=ttl_seconds,
+            max_entries=max_entries,
+            embedding_model=embedding_model,
+            cache_name="grade_cache.pkl",
+        )
+
+    @staticmethod
+    def make_text(question: str, response: str) -> str:
+        """The embedded key: question and response together"""
+        return f"{question}\n---\n{response}"
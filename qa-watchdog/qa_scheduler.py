@@ -0,0 +1,116 @@
+"""
+QA Scheduler - periodic suite runs on plain asyncio tasks
+
+Copyright (c) 2025 DecentralizedJM
+Licensed under MIT License
+"""
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, List
+
+from bot.watchdog import QAWatchdogBot
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+JobFn = Callable[[], Awaitable[None]]
+
+
+class SimpleScheduler:
+    """Three long-lived asyncio tasks instead of APScheduler's job store
+
+    Each job is one coroutine looping sleep -> run. A little jitter is
+    added to every delay so restarts don't line all jobs up on the same
+    tick.
+    """
+
+    JITTER_SECONDS = 5.0
+
+    def __init__(self):
+        self._loops: List[Callable[[], Awaitable[None]]] = []
+        self._tasks: List[asyncio.Task] = []
+
+    def add_cron(self, job: JobFn, hour: int, minute: int = 0, name: str = ""):
+        """Run `job` daily at hour:minute UTC"""
+        self._loops.append(lambda: self._cron_loop(job, hour, minute, name))
+
+    def add_interval(self, job: JobFn, hours: float, name: str = ""):
+        """Run `job` every `hours` hours, starting one interval from now"""
+        self._loops.append(lambda: self._interval_loop(job, hours, name))
+
+    def start(self):
+        """Spawn one task per job on the running loop"""
+        self._tasks = [asyncio.create_task(loop()) for loop in self._loops]
+
+    def shutdown(self, wait: bool = False):
+        """Cancel all job tasks (`wait` accepted for APScheduler parity)"""
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    def _jitter(self) -> float:
+        return random.uniform(0, self.JITTER_SECONDS)
+
+    async def _cron_loop(self, job: JobFn, hour: int, minute: int, name: str):
+        while True:
+            now = datetime.now(timezone.utc)
+            target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            if target <= now:
+                target += timedelta(days=1)
+            await asyncio.sleep((target - now).total_seconds() + self._jitter())
+            await self._run(job, name)
+
+    async def _interval_loop(self, job: JobFn, hours: float, name: str):
+        while True:
+            await asyncio.sleep(hours * 3600 + self._jitter())
+            await self._run(job, name)
+
+    @staticmethod
+    async def _run(job: JobFn, name: str):
+        try:
+            await job()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception(f"Scheduled job failed: {name}")
+
+
+def setup_qa_scheduler(bot: QAWatchdogBot, config: Config) -> SimpleScheduler:
+    """Schedule the daily suite, critical tests and hourly spot checks"""
+    scheduler = SimpleScheduler()
+
+    async def daily_suite():
+        logger.info("Scheduled daily QA suite starting")
+        results = await bot.run_qa_suite()
+        passed = sum(r.passed for r in results)
+        logger.info(f"Daily suite done: {passed}/{len(results)} passed")
+
+    async def critical_tests():
+        logger.info("Scheduled critical tests starting")
+        results = await bot.run_critical_tests()
+        passed = sum(r.passed for r in results)
+        logger.info(f"Critical tests done: {passed}/{len(results)} passed")
+
+    async def spot_check():
+        result = await bot.run_spot_check()
+        logger.info(
+            f"Spot check {result.test_case.id}: "
+            f"{'passed' if result.passed else 'FAILED'} ({result.score}/10)"
+        )
+
+    scheduler.add_cron(daily_suite, hour=config.DAILY_SUITE_HOUR, name="Daily QA suite")
+    scheduler.add_interval(
+        critical_tests, hours=config.CRITICAL_INTERVAL_HOURS, name="Critical tests"
+    )
+    scheduler.add_interval(
+        spot_check, hours=config.SPOT_CHECK_INTERVAL_HOURS, name="Hourly spot check"
+    )
+
+    logger.info(
+        f"QA scheduler configured: daily at {config.DAILY_SUITE_HOUR:02d}:00 UTC, "
+        f"critical every {config.CRITICAL_INTERVAL_HOURS}h, "
+        f"spot check every {config.SPOT_CHECK_INTERVAL_HOURS}h"
+    )
+    return scheduler
@@ -0,0 +1,41 @@
+"""
+Shared pytest setup for the watchdog smoke tests
+
+Copyright (c) 2025 DecentralizedJM
+Licensed under MIT License
+"""
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+# Make the watchdog packages (qa, bot, config) importable when pytest
+# runs from the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qa.grader import ResponseGrader  # noqa: E402
+from qa.report_manager import ReportManager  # noqa: E402
+from qa.test_bank import TestBank  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def mock_genai():
+    """Patch the Gemini client once for the whole session"""
+    with patch("qa.test_bank.genai.Client"), patch("qa.grader.genai.Client"):
+        yield
+
+
+@pytest.fixture(scope="session")
+def bank(mock_genai, tmp_path_factory):
+    return TestBank("fake-key", data_dir=str(tmp_path_factory.mktemp("bank")))
+
+
+@pytest.fixture(scope="session")
+def grader(mock_genai):
+    return ResponseGrader("fake-key")
+
+
+@pytest.fixture
+def report_manager(tmp_path):
+    return ReportManager(str(tmp_path))
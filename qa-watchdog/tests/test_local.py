@@ -0,0 +1,60 @@
+"""
+Local smoke tests for the QA Watchdog (no Telegram, no Gemini)
+
+Run:  python -m pytest tests/
+      (add -n auto for parallel workers when pytest-xdist is installed)
+
+Copyright (c) 2025 DecentralizedJM
+Licensed under MIT License
+"""
+from qa.test_bank import TestCase
+
+
+def test_testcase_hash():
+    a = TestCase(id="t1", question="How do I authenticate?", category="auth")
+    b = TestCase(id="t2", question="How do I authenticate?", category="auth")
+    assert a.unique_hash == b.unique_hash
+    assert len(a.unique_hash) == 12
+
+
+def test_generator_categories(bank):
+    gen = bank.generator
+    assert gen.generate_auth_question().category == "auth"
+    assert gen.generate_error_log_question().category == "error_log"
+    assert gen.generate_order_question().category == "order"
+    assert gen.generate_position_question().category == "position"
+    assert gen.generate_edge_case().category == "edge_case"
+
+
+def test_keyword_checks(grader):
+    tc = TestCase(
+        id="t1",
+        question="q",
+        category="auth",
+        expected_keywords=["X-Authentication", "secret"],
+        forbidden_keywords=["password"],
+    )
+    found, missing, forbidden = grader._check_keywords(
+        tc, "Use the x-authentication header with your PASSWORD"
+    )
+    assert found == {"X-Authentication"}
+    assert missing == {"secret"}
+    assert forbidden == {"password"}
+
+
+def test_grade_timeout(grader):
+    tc = TestCase(id="t1", question="q", category="auth")
+    result = grader.grade_timeout(tc, 60)
+    assert not result.passed
+    assert result.timed_out
+    assert result.score == 0.0
+
+
+def test_report_formatting(grader, report_manager):
+    tc = TestCase(id="t1", question="q", category="auth")
+    result = grader.grade_timeout(tc, 60)
+
+    path = report_manager.save_report(result)
+    assert report_manager.flush(timeout=5)
+    assert path.exists()
+    assert "QA Failure" in path.read_text()
@@ -99,7 +99,10 @@ class Config:
 
     # Futures listing watcher (MCP list_futures, diff vs snapshot, broadcast newly listed/delisted to ALLOWED_CHAT_IDS)
     ENABLE_FUTURES_LISTING_WATCHER: bool = True
-    
+
+    # Memoized validate() result (config is immutable in practice after from_env)
+    _validation_errors: Optional[List[str]] = field(default=None, repr=False, compare=False)
+
     @classmethod
     def from_env(cls) -> "Config":
         """Load configuration from environment variables"""
@@ -199,17 +202,24 @@ class Config:
         )
     
     def validate(self) -> List[str]:
-        """Validate configuration and return list of errors"""
-        errors = []
-        
-        if not self.TELEGRAM_BOT_TOKEN:
-            errors.append("TELEGRAM_BOT_TOKEN is required")
-        
-        if not self.GEMINI_API_KEY:
-            errors.append("GEMINI_API_KEY is required")
-        
-        return errors
-    
+        """Validate configuration and return list of errors (memoized per instance)"""
+        if self._validation_errors is None:
+            errors = []
+
+            if not self.TELEGRAM_BOT_TOKEN:
+                errors.append("TELEGRAM_BOT_TOKEN is required")
+
+            if not self.GEMINI_API_KEY:
+                errors.append("GEMINI_API_KEY is required")
+
+            self._validation_errors = errors
+
+        return self._validation_errors
+
+    def invalidate(self) -> None:
+        """Drop the memoized validate() result (for tests that mutate config)"""
+        self._validation_errors = None
+
     def is_valid(self) -> bool:
         """Check if configuration is valid"""
         return len(self.validate()) == 0
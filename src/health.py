@@ -30,6 +30,13 @@ _rag_pipeline = None
 _mcp_client = None
 _bot = None
 
+# Event-loop heartbeat (updated by main.py's heartbeat task).
+# None until the first tick so the health server can also run standalone.
+_last_tick: Optional[float] = None
+
+# Liveness fails if the main loop hasn't ticked within this window
+HEARTBEAT_STALE_SECONDS = 10.0
+
 
 def set_components(rag_pipeline=None, mcp_client=None, bot=None):
     """Set component references for health checks"""
@@ -39,6 +46,12 @@ def set_components(rag_pipeline=None, mcp_client=None, bot=None):
     _bot = bot
 
 
+def tick():
+    """Record that the main event loop is alive (called by the heartbeat task)"""
+    global _last_tick
+    _last_tick = time.monotonic()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for FastAPI"""
@@ -206,7 +219,21 @@ async def liveness():
     """
     Liveness probe - is the service running?
     Used by Kubernetes/Railway for restart decisions.
+
+    Fails if the main event loop stopped ticking (e.g. a blocking call leaked
+    into the loop) even though this server can still answer requests.
     """
+    if _last_tick is not None:
+        stale_for = time.monotonic() - _last_tick
+        if stale_for > HEARTBEAT_STALE_SECONDS:
+            return JSONResponse(
+                content={
+                    "status": "stalled",
+                    "version": __version__,
+                    "last_tick_seconds_ago": round(stale_for, 1),
+                },
+                status_code=503,
+            )
     return {"status": "alive", "version": __version__}
 
 
@@ -326,9 +353,8 @@ async def admin_reingest():
     except Exception as e:
         logger.exception("Reingest failed")
         raise HTTPException(status_code=500, detail=str(e))
-    if _rag_pipeline.semantic_cache:
-        _rag_pipeline.semantic_cache.clear()
-        logger.info("Cleared semantic cache after reingest")
+    if _rag_pipeline.invalidate_semantic_cache_if_changed(str(docs_dir)):
+        logger.info("Cleared semantic cache after reingest (docs changed)")
     return JSONResponse(
         content={
             "success": True,
@@ -6,13 +6,18 @@ Copyright (c) 2025 DecentralizedJM (https://github.com/DecentralizedJM)
 Licensed under MIT License
 """
 import logging
+import queue
 import sys
 import os
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any, Dict, Optional
 
 import structlog
 from structlog.types import Processor
 
+# Background listener that performs the actual stream writes for stdlib logging
+_log_listener: Optional[QueueListener] = None
+
 
 def add_environment_info(
     logger: logging.Logger, method_name: str, event_dict: Dict[str, Any]
@@ -106,12 +111,23 @@ def configure_logging(
         cache_logger_on_first_use=True,
     )
     
-    # Also configure standard library logging
-    logging.basicConfig(
-        format="%(message)s",
-        stream=sys.stdout,
-        level=getattr(logging, log_level.upper(), logging.INFO),
-    )
+    # Also configure standard library logging.
+    # Route records through a queue so emission in the hot path is O(enqueue);
+    # the QueueListener thread does the blocking stream write off the event loop.
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    _log_listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _log_listener.start()
+
+    root_logger = logging.getLogger()
+    root_logger.handlers = [QueueHandler(log_queue)]
+    root_logger.setLevel(getattr(logging, log_level.upper(), logging.INFO))
     
     # Suppress noisy loggers
     logging.getLogger("httpx").setLevel(logging.WARNING)
@@ -122,6 +138,14 @@ def configure_logging(
     return structlog.get_logger()
 
 
+def stop_logging_listener():
+    """Flush and stop the background log listener (call once on shutdown)"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
 def get_logger(name: Optional[str] = None) -> structlog.BoundLogger:
     """
     Get a structured logger instance.
@@ -157,6 +157,21 @@ If an endpoint isn't in this list or the provided docs, it doesn't exist. Say so
 
         logger.info(f"Initialized Gemini client: primary={self.model_name}, lite={self.lite_model_name}")
 
+    def warmup(self) -> bool:
+        """
+        Prewarm the client with a cheap metadata-only call so the first user
+        query doesn't pay auth + model-metadata fetch latency.
+
+        count_tokens only touches the metadata endpoint (no generation quota).
+        """
+        try:
+            self.client.models.count_tokens(model=self.model_name, contents="ping")
+            logger.info("Gemini client warmed up")
+            return True
+        except Exception as e:
+            logger.warning(f"Gemini warmup failed (first query will pay init cost): {e}")
+            return False
+
     def classify_query_domain(self, query: str) -> str:
         """
         Classify query as Mudrex-specific vs generic trading/system-design.
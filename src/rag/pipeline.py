@@ -4,9 +4,12 @@ RAG Pipeline - Orchestrates the retrieval and generation process
 Copyright (c) 2025 DecentralizedJM (https://github.com/DecentralizedJM)
 Licensed under MIT License - See LICENSE file for details.
 """
+import hashlib
+import json
 import logging
 import re
-from typing import List, Dict, Any, Optional, Tuple
+from pathlib import Path
+from typing import Callable, List, Dict, Any, Optional, Tuple
 
 import requests
 
@@ -218,16 +221,21 @@ class RAGPipeline:
         chunk_size: int = 1500,
         overlap: int = 200,
         section_max_size: int = 2000,
+        batch_size: int = 100,
+        progress_cb: Optional[Callable[[int], None]] = None,
     ) -> int:
         """
         Ingest documents from a directory into the vector store
-        
+
         Args:
             docs_directory: Path to documentation directory
             chunk_size: Maximum characters per chunk
             overlap: Overlap between chunks
             section_max_size: Maximum size of a markdown section before sub-splitting
-            
+            batch_size: Number of chunks per embedding API call
+            progress_cb: Optional callback invoked with the cumulative chunk count
+                after each batch (for live metrics during long ingests)
+
         Returns:
             Number of chunks added
         """
@@ -248,12 +256,75 @@ class RAGPipeline:
             section_max_size=section_max_size,
         )
         
-        # Add to vector store
-        self.vector_store.add_documents(texts, metadatas, ids)
+        # Add to vector store (embeddings computed batch_size chunks per API call).
+        # One batch at a time so progress is observable while ingest runs.
+        for start in range(0, len(texts), batch_size):
+            end = start + batch_size
+            self.vector_store.add_documents(
+                texts[start:end], metadatas[start:end], ids[start:end], batch_size=batch_size
+            )
+            if progress_cb:
+                try:
+                    progress_cb(min(end, len(texts)))
+                except Exception as e:
+                    logger.debug(f"Ingest progress callback failed: {e}")
         
         logger.info(f"Successfully ingested {len(texts)} chunks from {len(documents)} documents")
         return len(texts)
-    
+
+    def _compute_doc_hashes(self, docs_directory: str) -> Dict[str, str]:
+        """Compute a sha256 hash per markdown file under docs_directory"""
+        docs_path = Path(docs_directory)
+        return {
+            str(path.relative_to(docs_path)): hashlib.sha256(path.read_bytes()).hexdigest()
+            for path in sorted(docs_path.rglob("*.md"))
+        }
+
+    def invalidate_semantic_cache_if_changed(self, docs_directory: str) -> bool:
+        """
+        Clear the semantic cache only when the source docs actually changed.
+
+        Compares a per-file sha256 map against the one persisted alongside the
+        vector store, so redeploys with unchanged docs keep the cache warm
+        instead of re-paying retrieval + LLM cost for every repeat query.
+
+        Args:
+            docs_directory: Path to documentation directory
+
+        Returns:
+            True if the cache was cleared, False if it was kept
+        """
+        if not self.semantic_cache:
+            return False
+
+        hash_path = Path(config.CHROMA_PERSIST_DIR) / "doc_hashes.json"
+        current = self._compute_doc_hashes(docs_directory)
+
+        previous: Dict[str, str] = {}
+        try:
+            if hash_path.exists():
+                previous = json.loads(hash_path.read_text())
+        except Exception as e:
+            logger.warning(f"Could not read doc hash map: {e}")
+
+        try:
+            hash_path.parent.mkdir(parents=True, exist_ok=True)
+            hash_path.write_text(json.dumps(current, indent=2))
+        except Exception as e:
+            logger.warning(f"Could not persist doc hash map: {e}")
+
+        if previous == current:
+            logger.info("Docs unchanged since last ingest - keeping semantic cache warm")
+            return False
+
+        changed = sum(1 for p, h in current.items() if previous.get(p) != h)
+        removed = sum(1 for p in previous if p not in current)
+        logger.info(
+            f"Docs changed ({changed} new/modified, {removed} removed) - clearing semantic cache"
+        )
+        self.semantic_cache.clear()
+        return True
+
     def query(
         self,
         question: str,
@@ -327,15 +327,17 @@ class VectorStore:
         self,
         documents: List[str],
         metadatas: Optional[List[Dict[str, Any]]] = None,
-        ids: Optional[List[str]] = None
+        ids: Optional[List[str]] = None,
+        batch_size: int = 100,
     ) -> None:
         """
         Add documents to the vector store.
-        
+
         Args:
             documents: List of text documents to add
             metadatas: Optional metadata for each document
             ids: Optional unique IDs for documents (auto-generated if not provided)
+            batch_size: Number of texts per embedding API call
         """
         if not documents:
             logger.warning("No documents provided to add")
@@ -352,9 +354,9 @@ class VectorStore:
         logger.info(f"Generating embeddings for {len(documents)} documents...")
         
         if self.use_qdrant:
-            self._add_documents_qdrant(documents, metadatas, ids)
+            self._add_documents_qdrant(documents, metadatas, ids, batch_size=batch_size)
         else:
-            self._add_documents_pickle(documents, metadatas, ids)
+            self._add_documents_pickle(documents, metadatas, ids, batch_size=batch_size)
         
         logger.info(f"Added {len(documents)} documents to vector store")
     
@@ -362,11 +364,12 @@ class VectorStore:
         self,
         documents: List[str],
         metadatas: List[Dict[str, Any]],
-        ids: List[str]
+        ids: List[str],
+        batch_size: int = 100,
     ) -> None:
         """Add documents to Qdrant with batch embeddings"""
         # Get embeddings in batches
-        embeddings = self._get_embeddings_batch(documents)
+        embeddings = self._get_embeddings_batch(documents, batch_size=batch_size)
         
         # Prepare points for Qdrant
         points = []
@@ -402,17 +405,18 @@ class VectorStore:
         self,
         documents: List[str],
         metadatas: List[Dict[str, Any]],
-        ids: List[str]
+        ids: List[str],
+        batch_size: int = 100,
     ) -> None:
-        """Add documents to pickle storage"""
-        for doc, metadata, doc_id in zip(documents, metadatas, ids):
-            embedding = self._get_embedding(doc)
-            
+        """Add documents to pickle storage with batch embeddings"""
+        embeddings = self._get_embeddings_batch(documents, batch_size=batch_size)
+
+        for doc, embedding, metadata, doc_id in zip(documents, embeddings, metadatas, ids):
             self.documents.append(doc)
             self.embeddings.append(embedding)
             self.metadatas.append(metadata)
             self.ids.append(doc_id)
-        
+
         self._save_pickle_db()
     
     def search(
@@ -110,12 +110,19 @@ def mock_gemini_client():
     mock = MagicMock()
     mock.models = MagicMock()
     
-    # Mock embedding response
-    mock_embedding = MagicMock()
-    mock_embedding.values = [0.1] * 768
-    mock_embed_result = MagicMock()
-    mock_embed_result.embeddings = [mock_embedding]
-    mock.models.embed_content.return_value = mock_embed_result
+    # Mock embedding response (one embedding per input, mirroring the batch API)
+    def _embed_content(*args, **kwargs):
+        contents = kwargs.get("contents", args[0] if args else "")
+        count = len(contents) if isinstance(contents, list) else 1
+        result = MagicMock()
+        result.embeddings = []
+        for _ in range(count):
+            embedding = MagicMock()
+            embedding.values = [0.1] * 768
+            result.embeddings.append(embedding)
+        return result
+
+    mock.models.embed_content.side_effect = _embed_content
     
     # Mock generate_content response
     mock_response = MagicMock()